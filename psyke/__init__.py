@@ -11,6 +11,7 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score, f
 
 from psyke.schema import DiscreteFeature
 from psyke.utils import get_default_random_seed, Target, get_int_precision
+from psyke.utils.cache import cached_predict
 from tuprolog.theory import Theory
 from typing import Iterable
 import logging
@@ -44,9 +45,20 @@ class EvaluableModel(object):
         V = 3,
         FMI = 4
 
+    class Report(dict):
+        """
+        The scores computed by score_report, mapping each score to its value w.r.t. the dataframe instances and, if a
+        predictor is given, w.r.t. the predictor (fidelity).
+        """
+
+        def __init__(self, scores: dict[EvaluableModel.Score, list[float]], completeness: float):
+            super().__init__(scores)
+            self.completeness = completeness
+
     def __init__(self, discretization=None, normalization=None):
         self.discretization = [] if discretization is None else list(discretization)
         self.normalization = normalization
+        self._scored = None
 
     def predict(self, dataframe: pd.DataFrame) -> Iterable:
         """
@@ -86,27 +98,92 @@ class EvaluableModel(object):
               brute: bool = False, criterion: str = 'corners', n: int = 2,
               task: EvaluableModel.Task = Task.CLASSIFICATION,
               scoring_function: Iterable[EvaluableModel.Score] = [ClassificationScore.ACCURACY]):
-        extracted = np.array(
-            self.predict(dataframe.iloc[:, :-1]) if not brute else
-            self.brute_predict(dataframe.iloc[:, :-1], criterion, n)
-        )
-        idx = [prediction is not None for prediction in extracted]
+        if fidelity and predictor is None:
+            raise ValueError("Predictor must be not None to measure fidelity")
+        report = self.score_report(dataframe, predictor if fidelity else None, brute, criterion, n, task,
+                                   scoring_function)
+        res = dict(report), report.completeness
+        return res if completeness else res[0]
+
+    def score_report(self, dataframe: pd.DataFrame, predictor=None, brute: bool = False, criterion: str = 'corners',
+                     n: int = 2, task: EvaluableModel.Task = Task.CLASSIFICATION,
+                     scoring_function: Iterable[EvaluableModel.Score] = None) -> EvaluableModel.Report:
+        """
+        Computes many scores at once, predicting the dataframe only once.
+        The predictions are kept until the model changes, so further scores on the same dataframe are cheap.
+
+        :param dataframe: is the set of instances to be scored.
+        :param predictor: if provided, the scores are also computed w.r.t. its predictions (fidelity).
+        :param brute: if True, a brute prediction is executed.
+        :param criterion: creterion for brute prediction.
+        :param n: number of points for brute prediction with 'perimeter' criterion.
+        :param task: the task of the model.
+        :param scoring_function: the scores to compute, all the ones of the task if not provided.
+        :return: the report with the scores and the completeness of the model.
+        """
+        extracted = self.__predictions(dataframe, brute, criterion, n)
+        idx = np.not_equal(extracted, None)
         y_extracted = extracted[idx]
         true = [dataframe.iloc[idx, -1]]
-
-        if fidelity:
-            if predictor is None:
-                raise ValueError("Predictor must be not None to measure fidelity")
-            true.append(predictor.predict(dataframe.iloc[idx, :-1]).flatten())
+        if predictor is not None:
+            true.append(np.array(cached_predict(predictor, dataframe.iloc[idx, :-1])).flatten())
 
         if task == EvaluableModel.Task.REGRESSION:
             y_extracted = self.unscale(y_extracted, dataframe.columns[-1])
             true = [self.unscale(t, dataframe.columns[-1]) for t in true]
 
-        res = {
-                  score: EvaluableModel.__evaluate(true, y_extracted, score) for score in scoring_function
-              }, sum(idx) / len(idx)
-        return res if completeness else res[0]
+        if scoring_function is None:
+            scoring_function = list({
+                EvaluableModel.Task.CLASSIFICATION: EvaluableModel.ClassificationScore,
+                EvaluableModel.Task.REGRESSION: EvaluableModel.RegressionScore,
+                EvaluableModel.Task.CLUSTERING: EvaluableModel.ClusteringScore
+            }[task])
+        return EvaluableModel.Report(EvaluableModel.__evaluate_all(true, y_extracted, scoring_function),
+                                     idx.sum() / len(idx))
+
+    def __predictions(self, dataframe: pd.DataFrame, brute: bool, criterion: str, n: int) -> np.ndarray:
+        from psyke.utils.dataframe import HashableDataFrame
+        key = HashableDataFrame(dataframe.iloc[:, :-1]).fingerprint, brute, criterion, n
+        if self._scored is None or self._scored[0] != key:
+            self._scored = key, np.array(
+                self.predict(dataframe.iloc[:, :-1]) if not brute else
+                self.brute_predict(dataframe.iloc[:, :-1], criterion, n)
+            )
+        return self._scored[1]
+
+    @staticmethod
+    def __evaluate_all(y, y_hat, scoring_functions) -> dict[EvaluableModel.Score, list[float]]:
+        scores = {}
+        if len(y_hat) > 0:
+            regression = [s for s in scoring_functions if isinstance(s, EvaluableModel.RegressionScore)]
+            classification = [s for s in scoring_functions if s in [
+                EvaluableModel.ClassificationScore.ACCURACY, EvaluableModel.ClassificationScore.INVERSE_ACCURACY
+            ]]
+            if len(regression) > 0:
+                y_hat = np.asarray(y_hat, dtype=float)
+                errors = [np.asarray(yy, dtype=float) - y_hat for yy in y]
+                squares = [(e ** 2).sum() for e in errors]
+                for s in regression:
+                    if s == EvaluableModel.RegressionScore.MAE:
+                        scores[s] = [np.abs(e).mean() for e in errors]
+                    elif s == EvaluableModel.RegressionScore.MSE:
+                        scores[s] = [sse / len(y_hat) for sse in squares]
+                    else:
+                        scores[s] = [EvaluableModel.__r2(np.asarray(yy, dtype=float), sse)
+                                     for yy, sse in zip(y, squares)]
+            if len(classification) > 0:
+                accuracies = [np.mean(np.asarray(yy) == np.asarray(y_hat)) for yy in y]
+                for s in classification:
+                    scores[s] = accuracies if s == EvaluableModel.ClassificationScore.ACCURACY else \
+                        [1 - a for a in accuracies]
+        return {s: scores[s] if s in scores else EvaluableModel.__evaluate(y, y_hat, s) for s in scoring_functions}
+
+    @staticmethod
+    def __r2(y: np.ndarray, sse: float) -> float:
+        sst = ((y - y.mean()) ** 2).sum()
+        if sst == 0:
+            return 1. if sse == 0 else 0.
+        return 1 - sse / sst
 
     @staticmethod
     def __evaluate(y, y_hat, scoring_function):
@@ -152,11 +229,13 @@ class Extractor(EvaluableModel, ABC):
         super().__init__(discretization, normalization)
         self.predictor = predictor
 
-    def extract(self, dataframe: pd.DataFrame) -> Theory:
+    def extract(self, dataframe: pd.DataFrame, oracle=None) -> Theory:
         """
         Extracts rules from the underlying predictor.
 
         :param dataframe: is the set of instances to be used for the extraction.
+        :param oracle: if provided, the precomputed predictions of the underlying predictor on the dataframe.
+        :raise ValueError: if the oracle has been built on a different dataframe.
         :return: the theory created from the extracted rules.
         """
         raise NotImplementedError('extract')
@@ -333,13 +412,13 @@ class Extractor(EvaluableModel, ABC):
     def creepy(predictor, clustering, depth: int, error_threshold: float, output: Target = Target.CONSTANT,
                gauss_components: int = 2, ranks: [(str, float)] = [], ignore_threshold: float = 0.0,
                discretization=None, normalization: dict[str, tuple[float, float]] = None,
-               seed: int = get_default_random_seed()) -> Extractor:
+               seed: int = get_default_random_seed(), neighbors=None) -> Extractor:
         """
         Creates a new CReEPy extractor.
         """
         from psyke.extraction.hypercubic.creepy import CReEPy
         return CReEPy(predictor, clustering, depth, error_threshold, output, gauss_components, ranks, ignore_threshold,
-                      discretization, normalization, seed)
+                      discretization, normalization, seed, neighbors)
 
     @staticmethod
     def real(predictor, discretization=None) -> Extractor:
@@ -365,7 +444,7 @@ class Clustering(EvaluableModel, ABC):
     def __init__(self, discretization=None, normalization=None):
         super().__init__(discretization, normalization)
 
-    def fit(self, dataframe: pd.DataFrame):
+    def fit(self, dataframe: pd.DataFrame, oracle=None):
         raise NotImplementedError('fit')
 
     def explain(self):
@@ -373,18 +452,22 @@ class Clustering(EvaluableModel, ABC):
 
     @staticmethod
     def exact(depth: int = 2, error_threshold: float = 0.1, output: Target = Target.CONSTANT, gauss_components: int = 2,
-              discretization=None, normalization=None, seed: int = get_default_random_seed()) -> Clustering:
+              discretization=None, normalization=None, seed: int = get_default_random_seed(),
+              neighbors=None, keep_tree: bool = False) -> Clustering:
         """
         Creates a new ExACT instance.
         """
         from psyke.clustering.exact import ExACT
-        return ExACT(depth, error_threshold, output, gauss_components, discretization, normalization, seed)
+        return ExACT(depth, error_threshold, output, gauss_components, discretization, normalization, seed, neighbors,
+                     keep_tree)
 
     @staticmethod
     def cream(depth: int = 2, error_threshold: float = 0.1, output: Target = Target.CONSTANT, gauss_components: int = 2,
-              discretization=None, normalization=None, seed: int = get_default_random_seed()) -> Clustering:
+              discretization=None, normalization=None, seed: int = get_default_random_seed(),
+              neighbors=None, keep_tree: bool = False) -> Clustering:
         """
         Creates a new CREAM instance.
         """
         from psyke.clustering.cream import CREAM
-        return CREAM(depth, error_threshold, output, gauss_components, discretization, normalization, seed)
+        return CREAM(depth, error_threshold, output, gauss_components, discretization, normalization, seed, neighbors,
+                     keep_tree)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from copy import deepcopy
 from typing import Iterable
 
 import numpy as np
@@ -7,6 +8,7 @@ import pandas as pd
 
 from psyke.utils import Target, get_default_random_seed
 from psyke.clustering.exact import ExACT
+from psyke.clustering.neighbors import NearestNeighbor
 from psyke.extraction.hypercubic import Node, HyperCube, ClosedCube
 from psyke.clustering.utils import select_gaussian_mixture
 
@@ -17,30 +19,33 @@ class CREAM(ExACT):
     """
 
     def __init__(self, depth: int, error_threshold: float, output: Target = Target.CONSTANT, gauss_components: int = 5,
-                 discretization=None, normalization=None, seed: int = get_default_random_seed()):
-        super().__init__(depth, error_threshold, output, gauss_components, discretization, normalization, seed)
+                 discretization=None, normalization=None, seed: int = get_default_random_seed(),
+                 neighbors: NearestNeighbor = None, keep_tree: bool = False):
+        super().__init__(depth, error_threshold, output, gauss_components, discretization, normalization, seed,
+                         neighbors, keep_tree)
 
-    def __eligible_cubes(self, gauss_pred: np.ndarray, node: Node, clusters: int):
+    def __eligible_cubes(self, gauss_pred: np.ndarray, node: Node, clusters: int, predictions: np.ndarray):
         cubes = []
         for i in range(len(np.unique(gauss_pred))):
             df = node.dataframe.iloc[np.where(gauss_pred == i)]
             if len(df) == 0:
                 continue
-            inner_cube = self._create_cube(df, clusters)
-            indices = self._indices(inner_cube, node.dataframe)
-            if indices is None:
-                continue
-            right, left = self._split(inner_cube, node.cube, node.dataframe, indices)
-            cubes.append((
-                ((right.diversity + left.diversity) / 2, right.volume(), left.volume(), i),
-                (right, indices), (left, ~indices)
-            ))
-        return cubes
+            cubes.append((i, self._create_cube(df, clusters)))
+        cubes = [(i, cube, indices) for (i, cube), indices in
+                 zip(cubes, self._indices([cube for _, cube in cubes], node.dataframe)) if indices is not None]
+        if len(cubes) == 0:
+            return []
+        masks = np.array([indices for _, _, indices in cubes])
+        diversities = self._diversities(np.concatenate([masks, ~masks]), node.dataframe, predictions)
+        return [(
+            ((right + left) / 2, cube.volume(), node.cube.volume(), i), cube, indices
+        ) for (i, cube, indices), right, left in zip(cubes, diversities[:len(cubes)], diversities[len(cubes):])]
 
-    def _split(self, right: ClosedCube, outer_cube: ClosedCube, data: pd.DataFrame, indices: np.ndarray):
-        right.update(data.iloc[indices], self._predictor)
+    def _split(self, right: ClosedCube, outer_cube: ClosedCube, data: pd.DataFrame, indices: np.ndarray,
+               predictions: np.ndarray):
+        right.update_with_predictions(data.iloc[indices], predictions[indices])
         left = outer_cube.copy()
-        left.update(data.iloc[~indices], self._predictor)
+        left.update_with_predictions(data.iloc[~indices], predictions[~indices])
         return right, left
 
     def _iterate(self, surrounding: Node) -> Iterable[HyperCube]:
@@ -51,18 +56,24 @@ class CREAM(ExACT):
             data = ExACT._remove_string_label(node.dataframe)
             gauss_params = select_gaussian_mixture(data, self.gauss_components)
             gauss_pred = gauss_params[2].predict(data)
-            cubes = self.__eligible_cubes(gauss_pred, node, gauss_params[1])
+            predictions = self._predictor.predict(node.dataframe.iloc[:, :-1])
+            cubes = self.__eligible_cubes(gauss_pred, node, gauss_params[1], predictions)
             if len(cubes) < 1:
                 continue
-            _, right, left = min(cubes)
+            _, cube, indices = min(cubes, key=lambda c: c[0])
+            right, left = self._split(cube, node.cube, node.dataframe, indices, predictions)
+            right, left = (right, indices), (left, ~indices)
             # find_better_constraints(node.dataframe[right[1]], right[0])
             node.right = Node(node.dataframe[right[1]], right[0])
-            node.cube.update(node.dataframe[left[1]], self._predictor)
+            if self.keep_tree:
+                self._unsplit[node] = deepcopy(node.cube)
+            node.cube.update_with_predictions(node.dataframe[left[1]], predictions[left[1]])
             node.left = Node(node.dataframe[left[1]], left[0])
 
             if depth < self.depth:
-                to_split += [
-                    (error, depth + 1, np.random.uniform(), n) for (n, error) in
-                    zip(node.children, [right[0].diversity, left[0].diversity]) if error > self.error_threshold
-                ]
+                for child, error in zip(node.children, [right[0].diversity, left[0].diversity]):
+                    if error > self.error_threshold:
+                        if self.keep_tree:
+                            self._errors[child] = error
+                        to_split.append((error, depth + 1, np.random.uniform(), child))
         return self._node_to_cubes(surrounding)
\ No newline at end of file
@@ -2,34 +2,41 @@ from __future__ import annotations
 
 from abc import ABC
 from collections import Counter
+from copy import copy, deepcopy
 from typing import Iterable, Union
 
 import numpy as np
 import pandas as pd
 from sklearn.cluster import DBSCAN
-from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 
 from psyke.clustering import HyperCubeClustering
+from psyke.clustering.neighbors import NearestNeighbor, KDTreeNearestNeighbor
 from psyke.extraction.hypercubic import Node, ClosedCube, HyperCube
 from psyke.clustering.utils import select_gaussian_mixture, select_dbscan_epsilon
 from psyke.extraction.hypercubic.hypercube import ClosedRegressionCube, ClosedClassificationCube
+from psyke.oracle import Oracle
 from psyke.utils import Target, get_default_random_seed
 
 
 class ExACT(HyperCubeClustering, ABC):
     """
     Explanator implementing ExACT algorithm.
+    If keep_tree is true, the fit keeps what is needed to prune the tree for larger error thresholds (see pruned).
     """
 
     def __init__(self, depth: int = 2, error_threshold: float = 0.1, output: Target = Target.CONSTANT,
                  gauss_components: int = 2, discretization=None, normalization=None,
-                 seed: int = get_default_random_seed()):
+                 seed: int = get_default_random_seed(), neighbors: NearestNeighbor = None, keep_tree: bool = False):
         super().__init__(output, discretization, normalization)
         self.depth = depth
         self.error_threshold = error_threshold
         self.gauss_components = gauss_components
-        self._predictor = KNeighborsClassifier() if output == Target.CLASSIFICATION else KNeighborsRegressor()
-        self._predictor.n_neighbors = 1
+        self.neighbors = KDTreeNearestNeighbor() if neighbors is None else neighbors
+        self._predictor = None
+        self.keep_tree = keep_tree
+        self._tree = None
+        self._errors = {}
+        self._unsplit = {}
         self.seed = seed
 
     def __eligible_cubes(self, gauss_pred: np.ndarray, node: Node, clusters: int):
@@ -39,15 +46,45 @@ class ExACT(HyperCubeClustering, ABC):
             if len(df) == 0:
                 continue
             cubes.append(self._create_cube(df, clusters))
-        indices = [self._indices(cube, node.dataframe) for cube in cubes]
-        return cubes, indices
+        return cubes, self._indices(cubes, node.dataframe)
 
     @staticmethod
-    def _indices(cube: ClosedCube, data: pd.DataFrame) -> np.ndarray | None:
-        indices = cube.filter_indices(data.iloc[:, :-1])
-        if len(data.iloc[indices]) * len(data.iloc[~indices]) == 0:
-            return None
-        return indices
+    def _masks(cubes: list[ClosedCube], data: pd.DataFrame) -> np.ndarray:
+        """
+        Computes with a single broadcasted comparison which instances in data are inside each cube.
+
+        :return: a boolean matrix with one row for each cube and one column for each instance.
+        """
+        if len(cubes) == 0:
+            return np.zeros((0, len(data)), dtype=bool)
+        bounds = np.array([[cube[feature] for feature in data.columns[:-1]] for cube in cubes])
+        x = data.iloc[:, :-1].to_numpy()[np.newaxis]
+        return np.all((bounds[:, np.newaxis, :, 0] <= x) & (x <= bounds[:, np.newaxis, :, 1]), axis=2)
+
+    @staticmethod
+    def _indices(cubes: list[ClosedCube], data: pd.DataFrame) -> list[np.ndarray | None]:
+        return [indices if indices.any() and not indices.all() else None for indices in ExACT._masks(cubes, data)]
+
+    def _diversities(self, masks: np.ndarray, data: pd.DataFrame, predictions: np.ndarray) -> np.ndarray:
+        """
+        Computes the diversity that a cube would have for each group of instances selected by the rows of masks,
+        using grouped reductions over the predictions of the internal predictor.
+        """
+        counts = masks.sum(axis=1)
+        if self._output == Target.CLASSIFICATION:
+            _, labels = np.unique(predictions, return_inverse=True)
+            occurrences = masks.astype(int) @ np.eye(labels.max() + 1, dtype=int)[labels]
+            return 1 - occurrences.max(axis=1) / counts
+        if self._output == Target.CONSTANT:
+            centered = predictions - predictions.mean()
+            means = masks @ centered / counts
+            return np.sqrt(np.maximum(masks @ centered ** 2 / counts - means ** 2, 0))
+        diversities = []
+        for mask in masks:
+            cube = self._default_cube()
+            cube._update(data.iloc[mask, :-1], predictions[mask])
+            diversities.append(cube.diversity)
+        return np.array(diversities)
 
     def _create_cube(self, dataframe: pd.DataFrame, clusters: int) -> ClosedCube:
         data = ExACT._remove_string_label(dataframe)
@@ -57,11 +94,64 @@ class ExACT(HyperCubeClustering, ABC):
             True, self._output
         )
 
-    def fit(self, dataframe: pd.DataFrame):
+    def create_oracle(self, dataframe: pd.DataFrame) -> Oracle:
+        """
+        Creates the internal oracle of the algorithm, which can be shared by several fits on the same dataframe.
+
+        :param dataframe: the set of instances to be clustered.
+        :return: the nearest neighbor predictor fitted on dataframe, with its predictions on dataframe.
+        """
+        return Oracle(self.neighbors.fit(dataframe.iloc[:, :-1], dataframe.iloc[:, -1]), dataframe)
+
+    def fit(self, dataframe: pd.DataFrame, oracle: Oracle = None):
         np.random.seed(self.seed)
-        self._predictor.fit(dataframe.iloc[:, :-1], dataframe.iloc[:, -1])
-        self._surrounding = HyperCube.create_surrounding_cube(dataframe, True, self._output)
-        self._hypercubes = self._iterate(Node(dataframe, self._surrounding))
+        self._scored = None
+        if oracle is not None:
+            oracle.check(dataframe)
+        self._predictor = self.create_oracle(dataframe) if oracle is None else oracle
+        self._surrounding = self._predictor.surrounding_cube(True, self._output)
+        root, self._errors, self._unsplit = Node(dataframe, self._surrounding), {}, {}
+        self._hypercubes = self._iterate(root)
+        self._tree = self.__prunable(root) if self.keep_tree else None
+        self._errors, self._unsplit = {}, {}
+
+    def __prunable(self, node: Node) -> ClosedCube | tuple:
+        """
+        Turns the fitted tree into the nested tuples needed by pruned, without the instances of the nodes.
+        A leaf is its cube, whereas a split node is the tuple of its cube before the split, the error it was split for
+        (None for the root, which is always split) and the prunable right and left subtrees.
+        """
+        if node.right is None:
+            return node.cube
+        return self._unsplit[node], self._errors.get(node), self.__prunable(node.right), self.__prunable(node.left)
+
+    def pruned(self, error_threshold: float) -> ExACT:
+        """
+        Provides a copy of this clustering with a larger error threshold, obtained by pruning the fitted tree
+        instead of fitting a new one. The nodes that the larger threshold would not split are turned into leaves,
+        each one holding its cube as it was before being split.
+
+        :param error_threshold: the error threshold of the copy, not smaller than the one of this clustering.
+        :return: the pruned clustering.
+        :raise ValueError: if the clustering has not been fitted with keep_tree or the threshold is smaller.
+        """
+        if self._tree is None:
+            raise ValueError('Only a clustering fitted with keep_tree can be pruned')
+        if error_threshold < self.error_threshold:
+            raise ValueError('The error threshold of a pruned clustering cannot be smaller than the fitted one')
+        clustering = copy(self)
+        clustering.error_threshold, clustering._scored = error_threshold, None
+        clustering._hypercubes = ExACT._pruned_cubes(self._tree, error_threshold)
+        return clustering
+
+    @staticmethod
+    def _pruned_cubes(tree: ClosedCube | tuple, error_threshold: float) -> list[ClosedCube]:
+        if not isinstance(tree, tuple):
+            return [tree]
+        unsplit, error, right, left = tree
+        if error is not None and error <= error_threshold:
+            return [unsplit]
+        return ExACT._pruned_cubes(right, error_threshold) + ExACT._pruned_cubes(left, error_threshold)
 
     def get_hypercubes(self) -> Iterable[HyperCube]:
         return list(self._hypercubes)
@@ -94,12 +184,17 @@ class ExACT(HyperCubeClustering, ABC):
                 continue
             _, _, _, indices, cube = max(cubes)
 
-            cube.update(node.dataframe[indices], self._predictor)
+            predictions = self._predictor.predict(node.dataframe.iloc[:, :-1])
+            cube.update_with_predictions(node.dataframe[indices], predictions[indices])
             node.right = Node(node.dataframe[indices], cube)
-            node.cube.update(node.dataframe[~indices], self._predictor)
+            if self.keep_tree:
+                self._unsplit[node] = deepcopy(node.cube)
+            node.cube.update_with_predictions(node.dataframe[~indices], predictions[~indices])
             node.left = Node(node.dataframe[~indices], node.cube)
 
             if depth < self.depth and cube.diversity > self.error_threshold:
+                if self.keep_tree:
+                    self._errors[node.right] = cube.diversity
                 to_split.append((cube.diversity, depth + 1, np.random.uniform(), node.right))
         return self._node_to_cubes(surrounding)
 
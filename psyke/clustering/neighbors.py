@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from psyke.utils import get_default_random_seed
+
+
+class NearestNeighbor:
+    """
+    A 1-nearest neighbor predictor, used by the clustering algorithms as internal oracle.
+    """
+
+    def __init__(self):
+        self._x = None
+        self._y = None
+
+    def fit(self, x: pd.DataFrame | np.ndarray, y: pd.Series | np.ndarray) -> NearestNeighbor:
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y)
+        self._build()
+        return self
+
+    def predict(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if len(x) == 0:
+            return self._y[:0]
+        return self._y[self._query(x)]
+
+    def _build(self) -> None:
+        raise NotImplementedError('build')
+
+    def _query(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError('query')
+
+
+class KDTreeNearestNeighbor(NearestNeighbor):
+    """
+    Exact nearest neighbor search backed by a KD-tree.
+    """
+
+    def __init__(self, leaf_size: int = 30):
+        super().__init__()
+        self.leaf_size = leaf_size
+        self._tree = None
+
+    def _build(self) -> None:
+        self._tree = KDTree(self._x, leaf_size=self.leaf_size)
+
+    def _query(self, x: np.ndarray) -> np.ndarray:
+        return self._tree.query(x, k=1, return_distance=False)[:, 0]
+
+
+class RandomProjectionForest(NearestNeighbor):
+    """
+    Approximate nearest neighbor search over a forest of random projection trees.
+    Each tree recursively splits the instances at the median of their projection onto a random direction.
+    The nearest neighbor is searched among the instances sharing a leaf with the query in at least one tree,
+    so more trees give a higher recall at the price of a slower search.
+    Duplicated instances are held only once, since no split can separate them, and each tree provides at most
+    leaf_size candidates to a query, so a query is compared with at most n_trees * leaf_size instances.
+    """
+
+    def __init__(self, n_trees: int = 10, leaf_size: int = 32, batch_size: int = 1024,
+                 seed: int = get_default_random_seed()):
+        super().__init__()
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.batch_size = batch_size
+        self.seed = seed
+        self._trees = []
+        self._distinct = None
+
+    def _build(self) -> None:
+        generator = np.random.default_rng(self.seed)
+        self._distinct = np.sort(np.unique(self._x, axis=0, return_index=True)[1])
+        self._trees = [self.__build_tree(generator) for _ in range(self.n_trees)]
+
+    def __build_tree(self, generator: np.random.Generator) -> tuple[np.ndarray, ...]:
+        directions, thresholds, children, leaves = [], [], [], []
+        stack = [(self._distinct, self.__new_node(directions, thresholds, children))]
+        while len(stack) > 0:
+            indices, node = stack.pop()
+            if len(indices) > self.leaf_size:
+                direction = generator.normal(size=self._x.shape[1])
+                projections = self._x[indices] @ direction
+                threshold = np.median(projections)
+                left = projections <= threshold
+                if 0 < left.sum() < len(indices):
+                    directions[node], thresholds[node] = direction, threshold
+                    children[node] = (self.__new_node(directions, thresholds, children),
+                                      self.__new_node(directions, thresholds, children))
+                    stack += [(indices[left], children[node][0]), (indices[~left], children[node][1])]
+                    continue
+            children[node] = (-1, -len(leaves) - 1)
+            leaves.append(indices)
+        offsets = np.cumsum([0] + [len(leaf) for leaf in leaves])
+        return np.array(directions), np.array(thresholds), np.array(children), np.concatenate(leaves), offsets
+
+    def __new_node(self, directions: list, thresholds: list, children: list) -> int:
+        directions.append(np.zeros(self._x.shape[1]))
+        thresholds.append(0.)
+        children.append((-1, -1))
+        return len(children) - 1
+
+    @staticmethod
+    def __leaves(tree: tuple[np.ndarray, ...], x: np.ndarray) -> np.ndarray:
+        directions, thresholds, children, *_ = tree
+        nodes = np.zeros(len(x), dtype=int)
+        internal = children[nodes, 0] >= 0
+        while internal.any():
+            current = nodes[internal]
+            left = np.einsum('ij,ij->i', x[internal], directions[current]) <= thresholds[current]
+            nodes[internal] = np.where(left, children[current, 0], children[current, 1])
+            internal = children[nodes, 0] >= 0
+        return -children[nodes, 1] - 1
+
+    def __candidates(self, tree: tuple[np.ndarray, ...], x: np.ndarray) -> np.ndarray:
+        """
+        Provides the first leaf_size instances of the leaf reached by each query, padded with -1.
+        """
+        *_, indices, offsets = tree
+        leaves = RandomProjectionForest.__leaves(tree, x)
+        positions = offsets[leaves, np.newaxis] + np.arange(self.leaf_size)
+        return np.where(positions < offsets[leaves + 1, np.newaxis],
+                        indices[np.minimum(positions, len(indices) - 1)], -1)
+
+    def _query(self, x: np.ndarray) -> np.ndarray:
+        result = np.empty(len(x), dtype=int)
+        for start in range(0, len(x), self.batch_size):
+            batch = x[start:start + self.batch_size]
+            candidates = np.concatenate([self.__candidates(tree, batch) for tree in self._trees], axis=1)
+            distances = ((self._x[candidates] - batch[:, np.newaxis, :]) ** 2).sum(axis=2)
+            distances[candidates < 0] = np.inf
+            result[start:start + self.batch_size] = candidates[np.arange(len(batch)), distances.argmin(axis=1)]
+        return result
@@ -1,21 +1,41 @@
+from __future__ import annotations
+
 from abc import ABC
 
 import pandas as pd
 from tuprolog.theory import Theory
 
 from psyke import Extractor
+from psyke.oracle import Oracle
 
 
 class PedagogicalExtractor(Extractor, ABC):
 
     def __init__(self, predictor, discretization=None, normalization=None):
         Extractor.__init__(self, predictor=predictor, discretization=discretization, normalization=normalization)
+        self._oracle: Oracle | None = None
+
+    def extract(self, dataframe: pd.DataFrame, oracle: Oracle = None) -> Theory:
+        return self._extract_with(PedagogicalExtractor._oracle_of(self.predictor, dataframe, oracle))
+
+    @staticmethod
+    def _oracle_of(predictor, dataframe: pd.DataFrame, oracle: Oracle = None) -> Oracle:
+        if oracle is None:
+            return Oracle(predictor, dataframe)
+        oracle.check(dataframe)
+        return oracle
 
-    def extract(self, dataframe: pd.DataFrame) -> Theory:
-        new_y = pd.DataFrame(self.predictor.predict(dataframe.iloc[:, :-1])).set_index(dataframe.index)
-        data = dataframe.iloc[:, :-1].copy().join(new_y)
-        data.columns = dataframe.columns
-        return self._extract(data)
+    def _extract_with(self, oracle: Oracle) -> Theory:
+        """
+        Extracts from the oracle's dataframe, labelled with the predictions of the predictor. While extracting, the
+        oracle is available as _oracle, so that the predictor is queried only on the instances it has not seen yet.
+        """
+        self._scored = None
+        self._oracle = oracle
+        try:
+            return self._extract(oracle.dataframe)
+        finally:
+            self._oracle = None
 
     def _extract(self, dataframe: pd.DataFrame) -> Theory:
         raise NotImplementedError('extract')
@@ -5,11 +5,11 @@ from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
 from psyke.extraction import PedagogicalExtractor
 from psyke.extraction.cart.predictor import CartPredictor, LeafConstraints, LeafSequence
 from psyke import get_default_random_seed
-from psyke.schema import GreaterThan, DiscreteFeature
+from psyke.schema import GreaterThan, DiscreteFeature, Interval, Value
 from psyke.utils.logic import create_variable_list, create_head, create_term
 from tuprolog.core import clause, Var, Struct
 from tuprolog.theory import Theory, mutable_theory
-from typing import Iterable
+from typing import Iterable, Any
 import pandas as pd
 
 
@@ -40,16 +40,55 @@ class Cart(PedagogicalExtractor, ABC):
                                            isinstance(condition, GreaterThan)))
         return results
 
+    @staticmethod
+    def __condition_key(feature: str, condition: Value) -> tuple:
+        return (feature, type(condition), condition.lower, condition.upper, condition.standard) \
+            if isinstance(condition, Interval) else (feature, id(condition))
+
     @staticmethod
     def _simplify_nodes(nodes: list) -> Iterable:
-        simplified = [nodes.pop(0)]
-        while len(nodes) > 0:
-            first_node = nodes[0][0]
-            for k, conditions in first_node.items():
+        """
+        Removes from each rule but the first the conditions it shares with all the following rules, which are
+        removed from those rules too. A condition repeated in a rule is removed as many times as it is repeated in
+        every following rule, and the last rule loses all its conditions.
+        Since a removal affects all the following rules alike, it is only counted and applied to each rule when it
+        is reached. The multiplicities of the conditions in the following rules are aggregated backwards once, so
+        the cost is linear in the number of conditions.
+        """
+        first, nodes = nodes[0], nodes[1:]
+        counts = []
+        for rule, _ in nodes:
+            count = {}
+            for feature, conditions in rule.items():
+                for condition in conditions:
+                    key = Cart.__condition_key(feature, condition)
+                    count[key] = count.get(key, 0) + 1
+            counts.append(count)
+        following, shared = [None] * len(nodes), None
+        for i in range(len(nodes) - 1, -1, -1):
+            following[i] = shared
+            shared = counts[i] if shared is None else \
+                {key: min(n, shared[key]) for key, n in counts[i].items() if key in shared}
+        # The occurrences of each condition removed from the current rule and from all the following ones
+        simplified, removed = [first], {}
+        for (rule, prediction), count, after in zip(nodes, counts, following):
+            for key, n in count.items():
+                n = n if after is None else min(n, after.get(key, 0))
+                if n > removed.get(key, 0):
+                    removed[key] = n
+            if not any(key in removed for key in count):
+                simplified.append((rule, prediction))
+                continue
+            # The first occurrences of each condition are the removed ones, the others are kept
+            kept, seen = {}, {}
+            for feature, conditions in rule.items():
+                kept[feature] = []
                 for condition in conditions:
-                    if all(k in node[0] and condition in node[0][k] for node in nodes):
-                        [node[0][k].remove(condition) for node in nodes]
-            simplified.append(nodes.pop(0))
+                    key = Cart.__condition_key(feature, condition)
+                    seen[key] = seen.get(key, 0) + 1
+                    if seen[key] > removed.get(key, 0):
+                        kept[feature].append(condition)
+            simplified.append((kept, prediction))
         return [({k: v for k, v in rule.items() if v != []}, prediction) for rule, prediction in simplified]
 
     def _create_theory(self, data: pd.DataFrame) -> Theory:
@@ -80,16 +119,17 @@ class Cart(PedagogicalExtractor, ABC):
         return self._cart_predictor.predict(dataframe)
 
     def predict_why(self, data: dict[str, float], verbose=True):
-        prediction = None
-        conditions = {}
-        if self.normalization is not None:
-            data = {k: v * self.normalization[k][1] + self.normalization[k][0] if k in self.normalization else v
-                    for k, v in data.items()}
-        for conditions, prediction in self._cart_predictor:
-            if all(all(interval.is_in(data[variable]) for interval in intervals)
-                   for variable, intervals in conditions.items()):
-                break
-        return prediction, conditions
+        return self.explain(pd.DataFrame([data]))[0]
+
+    def explain(self, dataframe: pd.DataFrame) -> list[tuple[Any, LeafConstraints]]:
+        """
+        Provides the prediction and the explanation of each instance of the dataframe.
+        The explanation is the set of constraints of the leaf reached by the instance.
+
+        :param dataframe: the instances to explain.
+        :return: the prediction and the constraints of each instance, in the same order.
+        """
+        return [(prediction, constraints) for constraints, prediction in self._cart_predictor.explain(dataframe)]
 
     @property
     def n_rules(self) -> int:
@@ -1,6 +1,7 @@
-from collections import Iterable
-from typing import Union, Any
+from __future__ import annotations
+from typing import Union, Any, Iterable
 import numpy as np
+import pandas as pd
 from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
 from psyke.schema import Value, LessThan, GreaterThan, SchemaException
 
@@ -17,6 +18,7 @@ class CartPredictor:
                  normalization=None):
         self._predictor = predictor
         self.normalization = normalization
+        self._compiled = None
 
     def __get_constraints(self, nodes: Iterable[(int, bool)]) -> LeafConstraints:
         thresholds = [self._predictor.tree_.threshold[i[0]] for i in nodes]
@@ -37,27 +39,60 @@ class CartPredictor:
                 cond_dict[feature] = [cond]
         return cond_dict
 
-    def __get_leaves(self) -> Iterable[int]:
-        return [i for i, (left_child, right_child) in enumerate(zip(
-            self._left_children, self._right_children
-        )) if left_child == -1 and right_child == -1]
-
     def __get_prediction(self, node: int) -> Any:
         if hasattr(self._predictor, 'classes_'):
             return self._predictor.classes_[np.argmax(self._predictor.tree_.value[node])]
         else:
             return self._predictor.tree_.value[node]
 
-    def __path(self, node: int, path=None) -> Iterable[(int, bool)]:
-        path = [] if path is None else path
-        if node == 0:
-            return path
-        father = list(self._left_children if node in self._left_children else self._right_children).index(node)
-        return self.__path(father, [(father, node in self._left_children)] + path)
+    def __compile(self) -> list[tuple[int, LeafConstraints, Any]]:
+        """
+        Builds the constraints and the prediction of every leaf of the fitted tree, in the order of the node ids.
+        Parent pointers are derived once from the children arrays, so each path is walked in O(depth).
+        The result is cached until the tree is fitted again.
+        """
+        tree = self._predictor.tree_
+        if self._compiled is None or self._compiled[0] is not tree:
+            left, right = np.asarray(self._left_children), np.asarray(self._right_children)
+            internal = np.where(left != -1)[0]
+            parents = np.full(tree.node_count, -1)
+            parents[left[internal]], parents[right[internal]] = internal, internal
+            is_left = np.zeros(tree.node_count, dtype=bool)
+            is_left[left[internal]] = True
+            leaves = np.where((left == -1) & (right == -1))[0]
+            self._compiled = tree, [(leaf, self.__get_constraints(self.__path(leaf, parents, is_left)),
+                                     self.__get_prediction(leaf)) for leaf in leaves], \
+                {leaf: i for i, leaf in enumerate(leaves)}
+        return self._compiled[1]
+
+    @staticmethod
+    def __path(node: int, parents: np.ndarray, is_left: np.ndarray) -> Iterable[(int, bool)]:
+        path = []
+        while node != 0:
+            path.append((parents[node], is_left[node]))
+            node = parents[node]
+        return path[::-1]
 
     def __iter__(self) -> LeafSequence:
-        leaves = self.__get_leaves()
-        return ((self.__get_constraints(self.__path(i)), self.__get_prediction(i)) for i in leaves)
+        return (({feature: list(values) for feature, values in constraints.items()}, prediction)
+                for _, constraints, prediction in self.__compile())
+
+    def explain(self, data: pd.DataFrame) -> list[tuple[LeafConstraints, Any]]:
+        """
+        Provides the constraints and the prediction of the leaf reached by each instance, locating all the leaves with
+        a single traversal of the tree. Instances reaching the same leaf share the same constraints.
+
+        :param data: the instances to explain.
+        :return: the constraints and the prediction of each instance, in the same order.
+        """
+        leaves = self.__compile()
+        positions = self._compiled[2]
+        ids = self._predictor.apply(data[self._predictor.feature_names_in_])
+        explained = {}
+        for leaf in np.unique(ids):
+            _, constraints, prediction = leaves[positions[leaf]]
+            explained[leaf] = {feature: list(values) for feature, values in constraints.items()}, prediction
+        return [explained[leaf] for leaf in ids]
 
     def predict(self, data) -> Iterable:
         return self._predictor.predict(data)
@@ -68,7 +103,7 @@ class CartPredictor:
 
     @property
     def n_leaves(self) -> int:
-        return len(list(self.__get_leaves()))
+        return len(self.__compile())
 
     @property
     def _left_children(self) -> list[int]:
@@ -81,3 +116,4 @@ class CartPredictor:
     @predictor.setter
     def predictor(self, predictor: Union[DecisionTreeClassifier, DecisionTreeRegressor]):
         self._predictor = predictor
+        self._compiled = None
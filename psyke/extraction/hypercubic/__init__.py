@@ -13,9 +13,11 @@ from psyke.extraction import PedagogicalExtractor
 from psyke.extraction.hypercubic.hypercube import HyperCube, RegressionCube, ClassificationCube, ClosedCube, Point, \
     GenericCube
 from psyke.hypercubepredictor import HyperCubePredictor
+from psyke.oracle import Oracle
 from psyke.schema import Between, Outside, Value
 from psyke.utils.logic import create_variable_list, create_head, to_var, Simplifier
 from psyke.utils import Target
+from psyke.utils.cache import cached_predict
 from psyke.extraction.hypercubic.strategy import Strategy, FixedStrategy
 
 
@@ -37,10 +39,11 @@ class HyperCubeExtractor(HyperCubePredictor, PedagogicalExtractor, ABC):
         cubes.sort()
         self._hypercubes = [cube[2] for cube in cubes]
 
-    def extract(self, dataframe: pd.DataFrame) -> Theory:
-        theory = PedagogicalExtractor.extract(self, dataframe)
-        self._surrounding = HyperCube.create_surrounding_cube(dataframe, output=self._output)
-        self._surrounding.update(dataframe, self.predictor)
+    def extract(self, dataframe: pd.DataFrame, oracle: Oracle = None) -> Theory:
+        oracle = PedagogicalExtractor._oracle_of(self.predictor, dataframe, oracle)
+        theory = self._extract_with(oracle)
+        self._surrounding = oracle.surrounding_cube(output=self._output)
+        self._surrounding.update(dataframe, oracle)
         return theory
 
     def pairwise_fairness(self, data: dict[str, float], neighbor: dict[str, float]):
@@ -192,7 +195,7 @@ class FeatureRanker:
         self.feat = feat
 
     def fit(self, model, samples):
-        predictions = np.array(model.predict(samples)).flatten()
+        predictions = np.array(cached_predict(model, samples)).flatten()
         function = f_classif if isinstance(model, ClassifierMixin) else f_regression
         best = SelectKBest(score_func=function, k="all").fit(samples, predictions)
         self.scores = np.array(best.scores_) / max(best.scores_)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from copy import copy, deepcopy
 from itertools import product
 from typing import Iterable
 import numpy as np
@@ -8,6 +9,7 @@ from tuprolog.theory import Theory
 from psyke import get_default_random_seed
 from psyke.utils import Target
 from psyke.extraction.hypercubic import HyperCubeExtractor, Grid, HyperCube
+from psyke.oracle import Oracle
 
 
 class GridEx(HyperCubeExtractor):
@@ -15,6 +17,32 @@ class GridEx(HyperCubeExtractor):
     Explanator implementing GridEx algorithm, doi:10.1007/978-3-030-82017-6_2.
     """
 
+    class State:
+        """
+        The partition reached by an extraction at the end of its grid, from which a deeper grid can be resumed.
+        """
+
+        def __init__(self, extractor: GridEx, dataframe: pd.DataFrame, content, fake: pd.DataFrame):
+            self.algorithm = type(extractor)
+            self.output = extractor._output
+            self.grid = extractor.grid
+            self.depth = extractor.grid.iterations
+            self.min_examples = extractor.min_examples
+            self.threshold = extractor.threshold
+            self.dataframe = dataframe
+            self.fake = fake
+            self.content = deepcopy(content)
+            self.dimensions_to_ignore = set(extractor._dimensions_to_ignore)
+            self.random_state = np.random.get_state()
+
+        def resumable_by(self, extractor: GridEx, dataframe: pd.DataFrame) -> bool:
+            return self.algorithm == type(extractor) and self.output == extractor._output and \
+                self.min_examples == extractor.min_examples and self.threshold == extractor.threshold and \
+                self.depth <= extractor.grid.iterations and \
+                all(self.grid.get(f, i) == extractor.grid.get(f, i)
+                    for i in range(self.depth) for f in dataframe.columns[:-1]) and \
+                (self.dataframe is dataframe or self.dataframe.equals(dataframe))
+
     def __init__(self, predictor, grid: Grid, min_examples: int, threshold: float, output: Target = Target.CONSTANT,
                  discretization=None, normalization=None, seed: int = get_default_random_seed()):
         super().__init__(predictor, Target.CLASSIFICATION if isinstance(predictor, ClassifierMixin) else output,
@@ -22,8 +50,69 @@ class GridEx(HyperCubeExtractor):
         self.grid = grid
         self.min_examples = min_examples
         self.threshold = threshold
+        self.state: GridEx.State | None = None
+        self._resume_state: GridEx.State | None = None
+        self.path: list[GridEx] = []
+        self._splits: dict | None = None
+        self._merges: dict | None = None
+        self.seed = seed
         np.random.seed(seed)
 
+    def resume(self, state: GridEx.State | None) -> GridEx:
+        """
+        Makes the next extraction continue from the state of a previous one, so that only the grid levels beyond
+        the previous depth are computed. The state must come from an extraction of the same algorithm on the same
+        dataframe, with the same threshold and minimum examples and a grid sharing the first levels.
+
+        :param state: the state of the previous extraction, or None to start from scratch.
+        :return: this extractor.
+        """
+        self._resume_state = state
+        return self
+
+    def _resumed(self, dataframe: pd.DataFrame):
+        state = self._resume_state
+        if not state.resumable_by(self, dataframe):
+            raise ValueError('The extraction state is not compatible with this extractor')
+        np.random.set_state(state.random_state)
+        self._dimensions_to_ignore = set(state.dimensions_to_ignore)
+        return deepcopy(state.content), state.fake, state.depth
+
+    def extract_path(self, dataframe: pd.DataFrame, thresholds: Iterable[float], oracle: Oracle = None,
+                     share_samples: bool = True) -> list[Theory]:
+        """
+        Extracts one theory for each threshold in a single pass over the grid: the thresholds only differ in the
+        cells they stop splitting and in the merges they accept, so they walk one split tree, where each cell is
+        split, filled with synthetic samples and predicted only the first time a threshold reaches it, and each
+        merge is evaluated only once. The thresholds are visited from the smallest, which builds the deepest tree.
+        Since the synthetic samples of a cell are drawn only once, the theories are the ones of separate extractions
+        only when no cell needs synthetic samples (i.e., min_examples is never larger than the instances of a cell).
+        If share_samples is false, the thresholds only share the oracle and every extraction starts from the seed
+        of this extractor, so the theories are exactly the ones of separate extractions with the same seed.
+        After the extraction, path holds the extractor of each threshold, in the same order.
+
+        :param dataframe: the dataframe relative to the predictor's training data.
+        :param thresholds: the thresholds of the theories to extract.
+        :param oracle: the optional oracle providing the predictions of the predictor on the dataframe.
+        :param share_samples: if the split tree and its synthetic samples are shared among the thresholds.
+        :return: the extracted theories, one for each threshold.
+        """
+        thresholds = list(thresholds)
+        oracle = Oracle(self.predictor, dataframe) if oracle is None else oracle
+        splits, merges, extracted = {}, {}, {}
+        for threshold in sorted(set(thresholds)):
+            extractor = copy(self)
+            extractor.threshold, extractor._dimensions_to_ignore, extractor.path = threshold, set(), []
+            extractor.state, extractor._resume_state = None, None
+            np.random.seed(self.seed)
+            if share_samples:
+                extractor._splits, extractor._merges = splits, merges
+            theory = extractor.extract(dataframe, oracle)
+            extractor._splits, extractor._merges = None, None
+            extracted[threshold] = extractor, theory
+        self.path = [extracted[threshold][0] for threshold in thresholds]
+        return [extracted[threshold][1] for threshold in thresholds]
+
     def _extract(self, dataframe: pd.DataFrame) -> Theory:
         self._hypercubes = []
         self._surrounding = HyperCube.create_surrounding_cube(dataframe, output=self._output)
@@ -44,6 +133,19 @@ class GridEx(HyperCubeExtractor):
         return ranges
 
     def _cubes_to_split(self, cube, iteration, dataframe, fake, keep_empty=False):
+        # The shared split tree keeps its own copies, since the extractions (e.g., HEx) may update their cubes
+        if self._splits is None:
+            return self._split_cube(cube, iteration, dataframe, fake, keep_empty)
+        key = (iteration, keep_empty, cube)
+        if key not in self._splits:
+            to_split, new_fake = self._split_cube(cube, iteration, dataframe, fake, keep_empty)
+            self._splits[key] = deepcopy(to_split), new_fake.iloc[len(fake):]
+            return to_split, new_fake
+        to_split, samples = self._splits[key]
+        self._dimensions_to_ignore.update(f for f in cube.dimensions if self.grid.get(f, iteration) == 1)
+        return deepcopy(to_split), pd.concat([fake, samples])
+
+    def _split_cube(self, cube, iteration, dataframe, fake, keep_empty=False):
         to_split = []
         for p in product(*self._create_ranges(cube, iteration).values()):
             cube = self._default_cube()
@@ -52,16 +154,17 @@ class GridEx(HyperCubeExtractor):
             n = cube.count(dataframe)
             if n > 0 or keep_empty:
                 fake = pd.concat([fake, cube.create_samples(self.min_examples - n)])
-                cube.update(fake, self.predictor)
+                cube.update(fake, self._oracle)
                 to_split.append(cube)
         return to_split, fake
 
     def _iterate(self, dataframe: pd.DataFrame):
-        fake = dataframe.copy()
-        prev = [self._surrounding]
-        next_iteration = []
+        fake, prev, start = dataframe.copy(), [self._surrounding], 0
+        if self._resume_state is not None:
+            (self._hypercubes, prev), fake, start = self._resumed(dataframe)
+        next_iteration = [] if start == 0 else prev
 
-        for iteration in self.grid.iterate():
+        for iteration in self.grid.iterate()[start:]:
             next_iteration = []
             for cube in prev:
                 if cube.count(dataframe) == 0:
@@ -72,6 +175,7 @@ class GridEx(HyperCubeExtractor):
                 to_split, fake = self._cubes_to_split(cube, iteration, dataframe, fake)
                 next_iteration += [c for c in self._merge(to_split, fake)]
             prev = next_iteration.copy()
+        self.state = GridEx.State(self, dataframe, (self._hypercubes, next_iteration), fake)
         self._hypercubes += [cube for cube in next_iteration]
 
     @staticmethod
@@ -94,8 +198,13 @@ class GridEx(HyperCubeExtractor):
                         cube: HyperCube, other_cube: HyperCube,
                         merge_cache: dict[(HyperCube, HyperCube), HyperCube | None]) -> bool:
         if (cube in not_in_cache) or (other_cube in not_in_cache):
-            merged_cube = cube.merge_along_dimension(other_cube, feature)
-            merged_cube.update(dataframe, self.predictor)
+            if self._merges is not None and (cube, other_cube) in self._merges:
+                merged_cube = deepcopy(self._merges[(cube, other_cube)])
+            else:
+                merged_cube = cube.merge_along_dimension(other_cube, feature)
+                merged_cube.update(dataframe, self._oracle)
+                if self._merges is not None:
+                    self._merges[(cube, other_cube)] = deepcopy(merged_cube)
             merge_cache[(cube, other_cube)] = merged_cube
         return cube.output == other_cube.output if self._output == Target.CLASSIFICATION else \
             merge_cache[(cube, other_cube)].diversity < self.threshold
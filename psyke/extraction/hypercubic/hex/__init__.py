@@ -74,25 +74,30 @@ class HEx(GridEx):
         return parent_cube.error - new_cube.error > self.threshold * .6
 
     def _iterate(self, dataframe: pd.DataFrame):
-        fake = dataframe.copy()
-        self._surrounding.update(dataframe, self.predictor)
-        root = HEx.Node(self._surrounding, threshold=self.threshold)
-        current = [root]
-
-        for iteration in self.grid.iterate():
+        if self._resume_state is None:
+            fake, start = dataframe.copy(), 0
+            self._surrounding.update(dataframe, self._oracle)
+            root = HEx.Node(self._surrounding, threshold=self.threshold)
+            current = [root]
+        else:
+            (root, current), fake, start = self._resumed(dataframe)
+            self._surrounding = root.cube
+
+        for iteration in self.grid.iterate()[start:]:
             next_iteration = []
             for node in current:
                 if node.cube.diversity < self.threshold:
                     continue
                 children, fake = self._cubes_to_split(node.cube, iteration, dataframe, fake, True)
                 node.children = [HEx.Node(c, node, threshold=self.threshold) for c in children]
-                cleaned = node.update(fake, self.predictor, False)
+                cleaned = node.update(fake, self._oracle, False)
                 node.children = [HEx.Node(c, node, threshold=self.threshold) for c in self._merge(
                     [c for c, _ in cleaned], fake)]
                 next_iteration += [n for n in node.children]
 
             current = next_iteration.copy()
-        _ = root.update(fake, self.predictor, True)
+        self.state = GridEx.State(self, dataframe, (root, current), fake)
+        _ = root.update(fake, self._oracle, True)
         self._hypercubes = []
         linearized = root.linearize(fake)
         for depth in sorted(np.unique([d for (_, d) in linearized]), reverse=True):
@@ -196,7 +196,7 @@ class HyperCube:
 
     def filter_indices(self, dataset: pd.DataFrame) -> ndarray:
         v = np.array([v for _, v in self._dimensions.items()])
-        ds = dataset.to_numpy(copy=True)
+        ds = dataset.to_numpy()
         return np.all((v[:, 0] <= ds) & (ds < v[:, 1]), axis=1)
 
     def filter_dataframe(self, dataset: pd.DataFrame) -> pd.DataFrame:
@@ -434,7 +434,20 @@ class HyperCube:
 
     def update(self, dataset: pd.DataFrame, predictor) -> None:
         filtered = self.filter_dataframe(dataset.iloc[:, :-1])
-        predictions = predictor.predict(filtered)
+        self._update(filtered, predictor.predict(filtered))
+
+    def update_with_predictions(self, dataset: pd.DataFrame, predictions: ndarray) -> None:
+        """
+        Updates the cube as update does, taking the predictions of the instances in dataset as given.
+
+        :param dataset: the set of instances, the last column is ignored.
+        :param predictions: the predictions of every instance in dataset, in the same order.
+        """
+        indices = self.filter_indices(dataset.iloc[:, :-1])
+        if indices.any():
+            self._update(dataset.iloc[indices, :-1], np.asarray(predictions)[indices])
+
+    def _update(self, filtered: pd.DataFrame, predictions: ndarray) -> None:
         self._output = np.mean(predictions)
         self._diversity = np.std(predictions)
         self._error = (abs(predictions - self._output)).mean()
@@ -453,11 +466,13 @@ class RegressionCube(HyperCube):
     def update(self, dataset: pd.DataFrame, predictor) -> None:
         filtered = self.filter_dataframe(dataset.iloc[:, :-1])
         if len(filtered > 0):
-            predictions = predictor.predict(filtered)
-            self._output.fit(filtered, predictions)
-            self._diversity = self._error = (abs(self._output.predict(filtered) - predictions)).mean()
-            means = filtered.describe().loc['mean']
-            self._barycenter = Point(means.index.values, means.values)
+            self._update(filtered, predictor.predict(filtered))
+
+    def _update(self, filtered: pd.DataFrame, predictions: ndarray) -> None:
+        self._output.fit(filtered, predictions)
+        self._diversity = self._error = (abs(self._output.predict(filtered) - predictions)).mean()
+        means = filtered.describe().loc['mean']
+        self._barycenter = Point(means.index.values, means.values)
 
     def copy(self) -> RegressionCube:
         output = LinearRegression()
@@ -490,11 +505,13 @@ class ClassificationCube(HyperCube):
     def update(self, dataset: pd.DataFrame, predictor) -> None:
         filtered = self.filter_dataframe(dataset.iloc[:, :-1])
         if len(filtered > 0):
-            predictions = predictor.predict(filtered)
-            self._output = mode(predictions)
-            self._diversity = self._error = 1 - sum(p == self.output for p in predictions) / len(predictions)
-            means = filtered.describe().loc['mean']
-            self._barycenter = Point(means.index.values, means.values)
+            self._update(filtered, predictor.predict(filtered))
+
+    def _update(self, filtered: pd.DataFrame, predictions: ndarray) -> None:
+        self._output = mode(predictions)
+        self._diversity = self._error = 1 - sum(p == self.output for p in predictions) / len(predictions)
+        means = filtered.describe().loc['mean']
+        self._barycenter = Point(means.index.values, means.values)
 
     def copy(self) -> ClassificationCube:
         new_cube = ClassificationCube(self.dimensions.copy(), self._limits.copy(), self.output)
@@ -542,7 +559,7 @@ class ClosedCube(HyperCube):
 
     def filter_indices(self, dataset: pd.DataFrame) -> ndarray:
         v = np.array([v for _, v in self._dimensions.items()])
-        ds = dataset.to_numpy(copy=True)
+        ds = dataset.to_numpy()
         return np.all((v[:, 0] <= ds) & (ds <= v[:, 1]), axis=1)
 
     def copy(self) -> ClosedCube:
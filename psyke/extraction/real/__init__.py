@@ -1,8 +1,11 @@
-from functools import lru_cache
+from __future__ import annotations
+
+import pickle
+from hashlib import sha256
 from psyke.extraction import PedagogicalExtractor
 from psyke.extraction.real.utils import Rule, IndexedRuleSet
 from psyke.schema import DiscreteFeature
-from psyke.utils.dataframe import HashableDataFrame
+from psyke.utils.cache import cached_predict, cached_extraction, predictor_digest
 from psyke.utils.logic import create_term, create_head, create_variable_list
 from tuprolog.core import Var, Struct, Clause, clause
 from tuprolog.theory import MutableTheory, mutable_theory, Theory
@@ -22,14 +25,16 @@ class REAL(PedagogicalExtractor):
         super().__init__(predictor, discretization)
         self._ruleset: IndexedRuleSet = IndexedRuleSet()
         self._output_mapping = {}
+        self._columns: dict[str, int] = {}
+        self._compiled = None
 
     @property
     def n_rules(self):
         return len(self._ruleset.flatten())
 
-    def _covers(self, sample: pd.Series, rules: list[Rule]) -> bool:
-        new_rule = self._rule_from_example(sample)
-        return any([new_rule in rule for rule in rules])
+    @staticmethod
+    def _covers(sample: int, rules: list[Rule]) -> bool:
+        return any(rule.covers(sample) for rule in rules)
 
     def _create_body(self, variables: dict[str, Var], rule: Rule) -> list[Struct]:
         result = []
@@ -45,17 +50,18 @@ class REAL(PedagogicalExtractor):
                            str(sorted(list(set(dataset.iloc[:, -1])))[key]))
         return clause(head, self._create_body(variables, rule))
 
-    def _create_new_rule(self, sample: pd.Series) -> Rule:
+    def _create_new_rule(self, sample: pd.Series, prediction) -> Rule:
         rule = self._rule_from_example(sample)
-        return self._generalise(rule, sample)
+        return self._generalise(rule, sample, prediction)
 
     def _create_ruleset(self, dataset: pd.DataFrame) -> IndexedRuleSet:
         ruleset = IndexedRuleSet.create_indexed_ruleset(dataset)
-        for index, sample in dataset.iloc[:, :-1].iterrows():
-            prediction = list(self.predictor.predict(sample.to_frame().transpose()))[0]
+        predictions = cached_predict(self.predictor, dataset.iloc[:, :-1])
+        masks = Rule.masks(dataset.iloc[:, :-1].to_numpy())
+        for (index, sample), mask, prediction in zip(dataset.iloc[:, :-1].iterrows(), masks, predictions):
             rules = ruleset.get(self._output_mapping[prediction])
-            if not self._covers(sample, rules):
-                rules.append(self._create_new_rule(sample))
+            if not self._covers(mask, rules):
+                rules.append(self._create_new_rule(sample, prediction))
         return ruleset.optimize()
 
     def _create_theory(self, dataset: pd.DataFrame, ruleset: IndexedRuleSet) -> MutableTheory:
@@ -65,43 +71,70 @@ class REAL(PedagogicalExtractor):
             theory.assertZ(self._create_clause(dataset, variables, key, rule))
         return theory
 
-    def _generalise(self, rule: Rule, sample: pd.Series) -> Rule:
+    def _generalise(self, rule: Rule, sample: pd.Series, prediction) -> Rule:
         mutable_rule = rule.to_lists()
-        samples = sample.to_frame().transpose()
+        samples = sample.to_numpy()[np.newaxis]
         for predicate in rule.true_predicates:
-            samples = self._remove_antecedent(samples.copy(), predicate, mutable_rule)
-        return Rule(mutable_rule[0], mutable_rule[1]).reduce(self.discretization)
-
-    def _remove_antecedent(self, samples: pd.DataFrame, predicate: str, rule: list[list[str]]) -> (pd.DataFrame, bool):
+            samples = self._remove_antecedent(samples, sample.index, predicate, mutable_rule, prediction)
+        return Rule(mutable_rule[0], mutable_rule[1], self._columns).reduce(self.discretization)
+
+    def _remove_antecedent(self, samples: np.ndarray, columns: pd.Index, predicate: str, rule: list[list[str]],
+                           prediction) -> np.ndarray:
+        """
+        Every sample generated so far shares the prediction of the original one, thus the copies perturbed with all
+        the alternative values of the predicate's feature are checked against it with a single query.
+        """
         feature = [feature for feature in self.discretization if predicate in feature.admissible_values][0]
-        output = np.array(self.predictor.predict(samples))
-        copies = [samples.copy()]
-        samples[predicate] = 0
-        for f in [f for f in feature.admissible_values if f != predicate]:
-            copy = samples.copy()
-            copy[f] = 1
-            if all(output == np.array(self.predictor.predict(copy))):
-                copies.append(copy)
+        alternatives = [f for f in feature.admissible_values if f != predicate]
+        if len(alternatives) == 0:
+            return samples
+        base = samples.copy()
+        base[:, columns.get_loc(predicate)] = 0
+        copies = np.tile(base, (len(alternatives), 1, 1))
+        for copy, f in zip(copies, alternatives):
+            copy[:, columns.get_loc(f)] = 1
+        output = np.array(self.predictor.predict(pd.DataFrame(np.concatenate(copies), columns=columns)))
+        kept = []
+        for copy, f, out in zip(copies, alternatives, output.reshape(len(alternatives), -1)):
+            if all(out == prediction):
+                kept.append(copy)
                 rule[1].remove(f)
-        if len(copies) > 1:
+        if len(kept) > 0:
             rule[0].remove(predicate)
-        return pd.concat([df for df in copies], ignore_index=True)
-
-    @lru_cache(maxsize=512)
-    def _get_or_set(self, dataset: HashableDataFrame) -> IndexedRuleSet:
-        return self._create_ruleset(dataset)
-
-    def _internal_predict(self, sample: pd.Series):
-        x = [index for index, rule in self._ruleset.flatten() if REAL._rule_from_example(sample) in rule]
-        reverse_mapping = dict((v, k) for k, v in self._output_mapping.items())
-        return reverse_mapping[x[0]] if len(x) > 0 else None
-
-    @staticmethod
-    def _rule_from_example(sample: pd.Series) -> Rule:
+        return np.concatenate([samples] + kept)
+
+    def _get_or_set(self, dataset: pd.DataFrame) -> IndexedRuleSet:
+        return cached_extraction(self, dataset, lambda: self._create_ruleset(dataset), self.__persistent_key,
+                                 lambda ruleset: ruleset.nbytes)
+
+    def __persistent_key(self) -> str | None:
+        """
+        Digests the predictor and the discretization, or provides None if the predictor cannot be pickled (e.g.,
+        predictors wrapping native sessions), so that their results are not persisted.
+        """
+        predictor = predictor_digest(self.predictor)
+        if predictor is None:
+            return None
+        features = sorted((feature.name, sorted(feature.admissible_values.items(), key=lambda item: item[0]))
+                          for feature in self.discretization)
+        return sha256(pickle.dumps((predictor, features))).hexdigest()
+
+    def _compile(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Precomputes the predicate matrices of the flattened rules and the output of each rule, so that whole
+        dataframes are predicted with matrix operations.
+        """
+        if self._compiled is None:
+            reverse_mapping = {v: k for k, v in self._output_mapping.items()}
+            self._compiled = *self._ruleset.matrices(len(self._columns)), \
+                np.array([reverse_mapping[key] for key, _ in self._ruleset.flatten()])
+        return self._compiled
+
+    def _rule_from_example(self, sample: pd.Series) -> Rule:
         true_predicates, false_predicates = [], []
         for feature, value in sample.items():
             true_predicates.append(str(feature)) if value == 1 else false_predicates.append(str(feature))
-        return Rule(sorted(true_predicates), sorted(false_predicates))
+        return Rule(sorted(true_predicates), sorted(false_predicates), self._columns)
 
     def _subset(self, samples: pd.DataFrame, predicate: str) -> (pd.DataFrame, bool):
         samples_0 = samples.copy()
@@ -115,8 +148,18 @@ class REAL(PedagogicalExtractor):
         # Order the dataset by column to preserve reproducibility.
         dataframe = dataframe.sort_values(by=list(dataframe.columns.values), ascending=False)
         self._output_mapping = {value: index for index, value in enumerate(sorted(set(dataframe.iloc[:, -1])))}
-        self._ruleset = self._get_or_set(HashableDataFrame(dataframe))
+        self._columns = {column: index for index, column in enumerate(dataframe.columns[:-1])}
+        self._ruleset = self._get_or_set(dataframe)
+        self._compiled = None
         return self._create_theory(dataframe, self._ruleset)
 
     def _predict(self, dataframe) -> Iterable:
-        return np.array([self._internal_predict(data.transpose()) for _, data in dataframe.iterrows()])
+        true, false, outputs = self._compile()
+        covered = IndexedRuleSet.covered(dataframe.reindex(columns=list(self._columns)).to_numpy(), true, false)
+        found = covered.any(axis=1)
+        if found.all() and len(outputs) > 0:
+            return outputs[covered.argmax(axis=1)]
+        predictions = np.full(len(dataframe), None, dtype=object)
+        if found.any():
+            predictions[found] = outputs[covered[found].argmax(axis=1)]
+        return predictions
@@ -1,16 +1,28 @@
 from __future__ import annotations
+import sys
 from psyke import DiscreteFeature
 from typing import Iterable
+import numpy as np
 import pandas as pd
 
 
 class Rule:
+    """
+    A conjunction of predicates that must be true and predicates that must be false.
+    When the order of the discretized columns is provided, the predicates are also encoded as two integer bitmasks
+    over that order, so that subsumption and coverage are tested with bitwise operations.
+    """
 
-    def __init__(self, true_predicates: list[str], false_predicates: list[str]):
+    def __init__(self, true_predicates: list[str], false_predicates: list[str], columns: dict[str, int] = None):
         self.true_predicates = true_predicates
         self.false_predicates = false_predicates
+        self.columns = columns
+        self.true_mask = None if columns is None else Rule.mask(true_predicates, columns)
+        self.false_mask = None if columns is None else Rule.mask(false_predicates, columns)
 
     def __contains__(self, other: Rule) -> bool:
+        if self.columns is not None and self.columns is other.columns:
+            return self.true_mask & ~other.true_mask == 0 and self.false_mask & ~other.false_mask == 0
         return all([predicate in other.true_predicates for predicate in self.true_predicates]) and\
                all([predicate in other.false_predicates for predicate in self.false_predicates])
 
@@ -18,17 +30,56 @@ class Rule:
         return self.true_predicates == other.true_predicates and self.false_predicates == other.false_predicates
 
     def __hash__(self) -> int:
-        return hash(self.true_predicates) + hash(self.false_predicates)
+        return hash((tuple(self.true_predicates), tuple(self.false_predicates)))
+
+    def covers(self, sample: int) -> bool:
+        """
+        Checks whether a sample satisfies the rule.
+
+        :param sample: the bitmask of the predicates that are true for the sample, over the rule's column order.
+        :return: true if all the true predicates of the rule hold for the sample and none of its false predicates do.
+        """
+        return self.true_mask & ~sample == 0 and self.false_mask & sample == 0
 
     def reduce(self, features: Iterable[DiscreteFeature]) -> Rule:
         to_be_removed = [item for tp in self.true_predicates
                          for feature in features if tp in feature.admissible_values
                          for item in feature.admissible_values.keys()]
-        return Rule(self.true_predicates, [fp for fp in self.false_predicates if fp not in to_be_removed])
+        return Rule(self.true_predicates, [fp for fp in self.false_predicates if fp not in to_be_removed],
+                    self.columns)
 
     def to_lists(self) -> list[list[str]]:
         return [self.true_predicates.copy(), self.false_predicates.copy()]
 
+    @staticmethod
+    def mask(predicates: Iterable[str], columns: dict[str, int]) -> int:
+        mask = 0
+        for predicate in predicates:
+            mask |= 1 << columns[predicate]
+        return mask
+
+    @staticmethod
+    def masks(data: np.ndarray) -> list[int]:
+        """
+        Encodes each row of a discretized matrix as the bitmask of its true predicates.
+
+        :param data: the one-hot matrix, whose columns follow the rules' column order.
+        :return: the bitmask of each row.
+        """
+        packed = np.packbits(np.asarray(data) == 1, axis=1, bitorder='little')
+        return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+    @staticmethod
+    def matrix(masks: Iterable[int], n_columns: int) -> np.ndarray:
+        """
+        Decodes bitmasks into a boolean matrix with one row per mask.
+        """
+        masks = list(masks)
+        n_bytes = (n_columns + 7) // 8
+        buffer = b''.join(mask.to_bytes(n_bytes, 'little') for mask in masks)
+        bytes_matrix = np.frombuffer(buffer, dtype=np.uint8).reshape(len(masks), n_bytes)
+        return np.unpackbits(bytes_matrix, axis=1, bitorder='little')[:, :n_columns].astype(bool)
+
 
 class IndexedRuleSet(dict[int, list[Rule]]):
 
@@ -48,6 +99,41 @@ class IndexedRuleSet(dict[int, list[Rule]]):
             if any(rule in other_rule for other_rule in rules if other_rule != rule)
         ]
 
+    @property
+    def nbytes(self) -> int:
+        """
+        Estimates the size of the rule set from the bitmasks of its rules, without measuring the rules' objects.
+        """
+        return sys.getsizeof(self) + sum(2 * ((len(rule.columns) + 7) // 8) for _, rule in self.flatten()
+                                         if rule.columns is not None)
+
+    def matrices(self, n_columns: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Decodes the true and the false predicates of the rules, in flattening order, into two integer matrices with
+        one row per rule.
+
+        :param n_columns: the number of columns of the rules' column order.
+        :return: the matrices of the true and of the false predicates.
+        """
+        rules = [rule for _, rule in self.flatten()]
+        return Rule.matrix([rule.true_mask for rule in rules], n_columns).astype(int), \
+            Rule.matrix([rule.false_mask for rule in rules], n_columns).astype(int)
+
+    def coverage(self, data: np.ndarray) -> np.ndarray:
+        """
+        Checks all the rules against all the rows of a discretized matrix at once.
+        The rules must be encoded over the column order of the matrix.
+
+        :param data: the one-hot matrix of the samples.
+        :return: a boolean matrix with one row per sample and one column per rule, in flattening order.
+        """
+        return IndexedRuleSet.covered(data, *self.matrices(np.shape(data)[1]))
+
+    @staticmethod
+    def covered(data: np.ndarray, true: np.ndarray, false: np.ndarray) -> np.ndarray:
+        data = np.asarray(data) == 1
+        return ((~data).astype(int) @ true.T == 0) & (data.astype(int) @ false.T == 0)
+
     @staticmethod
     def create_indexed_ruleset(dataset: pd.DataFrame) -> IndexedRuleSet:
         return IndexedRuleSet({index: [] for index, _ in enumerate(set(dataset.iloc[:, -1]))})
\ No newline at end of file
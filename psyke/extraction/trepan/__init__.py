@@ -1,12 +1,13 @@
+import heapq
+from itertools import count
 import numpy as np
 from psyke.extraction import PedagogicalExtractor
 from psyke.extraction.trepan.utils import Node, Split, SplitLogic
 from psyke import DiscreteFeature
 from psyke.utils.logic import create_term, create_variable_list, create_head
-from psyke.utils.sorted import SortedList
 from tuprolog.core import Var, Struct, clause
 from tuprolog.theory import MutableTheory, mutable_theory, Theory
-from typing import Iterable, Union, Any
+from typing import Iterable, Union
 import pandas as pd
 
 
@@ -19,18 +20,21 @@ class Trepan(PedagogicalExtractor):
         self.max_depth = max_depth
         self.split_logic = split_logic
         self._root: Node
+        self._counter = count()
+        self._compiled = None
 
     @property
     def n_rules(self):
         return sum(1 for _ in self._root)
 
     def _best_split(self, node: Node, names: Iterable[str]) -> Union[tuple[Node, Node], None]:
-        if node.samples.shape[0] < self.min_examples:
+        if len(node.indices) < self.min_examples:
             raise NotImplementedError()
         if node.n_classes == 1:
             return None
         splits = Trepan._create_splits(node, names)
-        return None if len(splits) == 0 or splits[0].children[0].depth > self.max_depth else splits[0].children
+        best = Trepan._create_split(node, splits[0][-1]) if len(splits) > 0 else None
+        return None if best is None or best.children[0].depth > self.max_depth else best.children
 
     def _compact(self):
         nodes = [self._root]
@@ -47,30 +51,30 @@ class Trepan(PedagogicalExtractor):
             result.append(create_term(variables[feature.name], feature.admissible_values[constraint], value == 1.0))
         return result
 
-    @staticmethod
-    def _create_samples(node: Node, column: str, value: float) -> pd.DataFrame:
-        return node.samples.loc[node.samples[column] == value]
-
     @staticmethod
     def _create_split(node: Node, column: str) -> Union[Split, None]:
-        true_examples = Trepan._create_samples(node, column, 1.0)
-        false_examples = Trepan._create_samples(node, column, 0.0)
-        true_constrains = list(node.constraints) + [(column, 1.0)]
-        false_constrains = list(node.constraints) + [(column, 0.0)]
-        true_node = Node(true_examples, node.n_examples, true_constrains, depth=node.depth + 1)\
-            if true_examples.shape[0] > 0 else None
-        false_node = Node(false_examples, node.n_examples, false_constrains, depth=node.depth + 1)\
-            if false_examples.shape[0] > 0 else None
-        return None if true_node is None or false_node is None else Split(node, (true_node, false_node))
+        true_node, false_node = node.child(column, 1.0), node.child(column, 0.0)
+        return None if len(true_node.indices) == 0 or len(false_node.indices) == 0 else \
+            Split(node, (true_node, false_node))
 
     @staticmethod
-    def _create_splits(node: Node, names: Iterable[str]) -> SortedList[Split]:
+    def _create_splits(node: Node, names: Iterable[str]) -> list[tuple[float, int, str]]:
+        """
+        Evaluates the splits of the node on all the candidate columns at once, through the class counts of the
+        samples having each column true or false, and ranks them in a heap by their exact priority.
+        Ties are broken by the order of the columns. The best split is the first item of the heap.
+        """
         splits, constrains = Trepan._init_splits(node)
-        for column in names:
-            if column not in constrains:
-                split = Trepan._create_split(node, column)
-                if split is not None:
-                    splits.add(split)
+        candidates = [(index, column) for index, column in enumerate(names) if column not in constrains]
+        if len(candidates) == 0:
+            return splits
+        values = node.matrix[node.indices][:, [node.columns[column] for _, column in candidates]]
+        labels = (node.codes[:, np.newaxis] == np.arange(len(node.classes))).astype(int)
+        true_counts, false_counts = (values == 1.0).T.astype(int) @ labels, (values == 0.0).T.astype(int) @ labels
+        valid = (true_counts.sum(axis=1) > 0) & (false_counts.sum(axis=1) > 0)
+        priorities = Split.priorities(node, true_counts[valid], false_counts[valid])
+        for priority, (index, column) in zip(priorities, [candidate for candidate, v in zip(candidates, valid) if v]):
+            heapq.heappush(splits, (float(priority), index, column))
         return splits
 
     def _create_theory(self, name: str, sort: bool = True) -> MutableTheory:
@@ -85,16 +89,22 @@ class Trepan(PedagogicalExtractor):
             )
         return theory
 
-    def _init(self, dateset: pd.DataFrame) -> SortedList[Node]:
+    def _init(self, dateset: pd.DataFrame) -> list[tuple[float, int, Node]]:
         self._root = Node(dateset, dateset.shape[0])
-        queue: SortedList[Node] = SortedList(lambda x, y: int(x.priority - y.priority))
-        queue.add(self._root)
+        self._counter = count()
+        queue: list[tuple[float, int, Node]] = []
+        self._enqueue(queue, self._root)
         return queue
 
+    def _enqueue(self, queue: list[tuple[float, int, Node]], node: Node) -> None:
+        """
+        Pushes a node in the heap of the nodes to expand, ordered by exact priority and then by insertion order.
+        """
+        heapq.heappush(queue, (node.priority, next(self._counter), node))
+
     @staticmethod
-    def _init_splits(node: Node) -> tuple[SortedList[Split], Iterable[str]]:
-        return SortedList(lambda x, y: int(x.priority - y.priority)),\
-               set(constraint[0] for constraint in node.constraints)
+    def _init_splits(node: Node) -> tuple[list[tuple[float, int, str]], Iterable[str]]:
+        return [], set(constraint[0] for constraint in node.constraints)
 
     @staticmethod
     def _nodes_to_remove(node: Node, nodes: list[Node]) -> list[Node]:
@@ -107,18 +117,6 @@ class Trepan(PedagogicalExtractor):
                 nodes.append(child)
         return to_remove
 
-    @staticmethod
-    def _internal_predict(x: pd.Series, node: Node, categories: Iterable) -> Any:
-        for child in node.children:
-            skip = False
-            for constraint, value in child.constraints:
-                if x[constraint] != value:
-                    skip = True
-                    continue
-            if not skip:
-                return Trepan._internal_predict(x, child, categories)
-        return node.dominant
-
     def _optimize(self) -> None:
         n, nodes = 0, [self._root]
         while len(nodes) > 0:
@@ -139,19 +137,54 @@ class Trepan(PedagogicalExtractor):
     def _extract(self, dataframe: pd.DataFrame) -> Theory:
         queue = self._init(dataframe)
         while len(queue) > 0:
-            node = queue.pop()
+            node = heapq.heappop(queue)[-1]
             if self.split_logic == SplitLogic.DEFAULT:
                 best: Union[tuple[Node, Node], None] = self._best_split(node, dataframe.columns[:-1])
                 if best is None:
                     continue
             else:
                 raise Exception('Illegal split logic')
-            queue.add_all(best)
+            for child in best:
+                self._enqueue(queue, child)
             node.children += list(best)
         self._optimize()
+        self._compiled = None
         return self._create_theory(dataframe.columns[-1])
 
+    def _compile(self) -> tuple:
+        """
+        Flattens the tree into arrays, numbering the nodes breadth first so that every child follows its parent:
+        the dominant class of each node, the range of the children of each node, the node pointed by each child and
+        the range of its constraints, as column indices and values.
+        """
+        if self._compiled is None:
+            nodes, columns = [self._root], {}
+            dominants, children, pointers, constraints, features, values = [], [0], [], [0], [], []
+            for node in nodes:
+                dominants.append(node.dominant)
+                for child in node.children:
+                    pointers.append(len(nodes))
+                    nodes.append(child)
+                    for constraint, value in child.constraints:
+                        features.append(columns.setdefault(constraint, len(columns)))
+                        values.append(value)
+                    constraints.append(len(features))
+                children.append(len(pointers))
+            self._compiled = list(columns), np.array(dominants), np.array(children), np.array(pointers, dtype=int), \
+                np.array(constraints), np.array(features, dtype=int), np.array(values, dtype=float)
+        return self._compiled
+
     def _predict(self, dataframe: pd.DataFrame) -> Iterable:
-        return np.array(
-            [Trepan._internal_predict(sample, self._root, dataframe.columns[-1]) for _, sample in dataframe.iterrows()]
-        )
+        columns, dominants, children, pointers, constraints, features, values = self._compile()
+        data = dataframe[columns].to_numpy()
+        current = np.zeros(dataframe.shape[0], dtype=int)
+        for node in range(len(dominants)):
+            rows = np.flatnonzero(current == node)
+            for child in range(children[node], children[node + 1]):
+                if len(rows) == 0:
+                    break
+                start, end = constraints[child], constraints[child + 1]
+                satisfied = (data[rows][:, features[start:end]] == values[start:end]).all(axis=1)
+                current[rows[satisfied]] = pointers[child]
+                rows = rows[~satisfied]
+        return dominants[current]
@@ -1,18 +1,55 @@
 from __future__ import annotations
+from copy import copy
 from itertools import chain
 from typing import Iterable, Any
+import numpy as np
 import pandas as pd
 
 
 class Node:
+    """
+    A node of the Trepan tree. The features of the dataframe are stored once in a NumPy matrix and its targets are
+    label encoded once, both shared by all the nodes of the tree; each node only holds the indices of its samples.
+    The class counts of the samples are computed once, as a bincount over their label codes, and all the statistics
+    of the node are derived from them.
+    """
 
     def __init__(self, samples: pd.DataFrame, n_examples: int, constraints: Iterable[tuple[str, float]] = None,
                  children: list[Node] = None, depth: int = 0):
-        self.samples = samples
         self.n_examples = n_examples
         self.constraints = [] if constraints is None else constraints
         self.children = [] if children is None else children
         self.depth = depth
+        self.dataframe = samples
+        self.columns = {column: index for index, column in enumerate(samples.columns[:-1])}
+        self.matrix = samples.iloc[:, :-1].to_numpy()
+        self.classes, self.labels = np.unique(samples.iloc[:, -1].to_numpy(), return_inverse=True)
+        self.indices = np.arange(samples.shape[0])
+        self.counts = np.bincount(self.labels, minlength=len(self.classes))
+
+    def child(self, column: str, value: float) -> Node:
+        """
+        Creates the child node holding the samples of this node having the given value for the column.
+
+        :param column: the column of the constraint.
+        :param value: the value of the column.
+        :return: the child node, sharing the data of this node.
+        """
+        child = copy(self)
+        child.constraints = list(self.constraints) + [(column, value)]
+        child.children = []
+        child.depth = self.depth + 1
+        child.indices = self.indices[self.matrix[self.indices, self.columns[column]] == value]
+        child.counts = np.bincount(self.labels[child.indices], minlength=len(self.classes))
+        return child
+
+    @property
+    def samples(self) -> pd.DataFrame:
+        return self.dataframe.iloc[self.indices]
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self.labels[self.indices]
 
     def __str__(self):
         name = ''.join(('' if c[1] > 0 else '!') + c[0] + ', ' for c in self.constraints)
@@ -24,23 +61,23 @@ class Node:
 
     @property
     def fidelity(self) -> float:
-        return 1.0 * self.correct / (self.samples.shape[0] if self.samples.shape[0] > 0 else 1)
+        return 1.0 * self.correct / (len(self.indices) if len(self.indices) > 0 else 1)
 
     @property
     def reach(self) -> float:
-        return 1.0 * self.samples.shape[0] / self.n_examples
+        return 1.0 * len(self.indices) / self.n_examples
 
     @property
     def correct(self) -> float:
-        return sum(self.samples.iloc[:, -1] == self.dominant)
+        return int(self.counts.max()) if len(self.indices) > 0 else 0
 
     @property
     def dominant(self) -> Any:
-        return self.samples.iloc[:, -1].mode()[0] if self.samples.shape[0] > 0 else ''
+        return self.classes[np.argmax(self.counts)] if len(self.indices) > 0 else ''
 
     @property
     def n_classes(self) -> int:
-        return len(set(self.samples.iloc[:, -1]))
+        return int(np.count_nonzero(self.counts))
 
     def __iter__(self) -> Iterable[Node]:
         for child in chain(*map(iter, self.children)):
@@ -62,6 +99,24 @@ class Split:
     def priority(self) -> float:
         return self.__priority(self.parent)
 
+    @staticmethod
+    def priorities(parent: Node, true_counts: np.ndarray, false_counts: np.ndarray) -> np.ndarray:
+        """
+        Computes the priorities of many splits of the same node at once.
+
+        :param parent: the node to split.
+        :param true_counts: the class counts of the true child of each split, one row per split.
+        :param false_counts: the class counts of the false child of each split, one row per split.
+        :return: the priority of each split.
+        """
+        priorities = -(true_counts.max(axis=1) / true_counts.sum(axis=1) +
+                       false_counts.max(axis=1) / false_counts.sum(axis=1))
+        n_classes = parent.n_classes
+        for counts in [true_counts, false_counts]:
+            priorities = priorities - np.where(n_classes > np.count_nonzero(counts, axis=1), Split.PRIORITY_BONUS, 0)
+        return priorities + np.where(true_counts.argmax(axis=1) == false_counts.argmax(axis=1),
+                                     Split.PRIORITY_PENALTY, 0)
+
     def __priority(self, parent: Node) -> float:
         true_node, false_node = self.children
         priority = - (true_node.fidelity + false_node.fidelity)
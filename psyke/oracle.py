@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from psyke.utils import Target
+from psyke.utils.cache import cached_predict
+
+
+class Oracle:
+    """
+    The predictions of a predictor on a dataframe, computed once and shared by many extractions.
+
+    An oracle can be used wherever its predictor is expected. The predictions of the instances belonging to the
+    dataframe are read from the precomputed ones, and so are the ones of any instance already predicted through the
+    oracle (e.g., the synthetic samples generated by the extractions), which are recognised by their values.
+    Only the instances never seen before are forwarded to the predictor, and up to max_samples of them are memoized.
+
+    Parameters
+    ----------
+    predictor : the underlying predictor.
+    dataframe : the dataframe whose instances are predicted, the last column is the target one.
+    max_samples : the maximum number of instances outside the dataframe whose predictions are memoized.
+    """
+
+    def __init__(self, predictor, dataframe: pd.DataFrame, max_samples: int = 1 << 20):
+        self.predictor = predictor
+        self.max_samples = max_samples
+        self.x = dataframe.iloc[:, :-1].to_numpy()
+        self.predictions = np.array(cached_predict(predictor, dataframe.iloc[:, :-1]))
+        self.dataframe = dataframe.iloc[:, :-1].copy().join(
+            pd.DataFrame(self.predictions).set_index(dataframe.index))
+        self.dataframe.columns = dataframe.columns
+        self._fingerprint = Oracle.__fingerprint(dataframe)
+        self._memo: dict[bytes, object] | None = None
+        self._samples = 0
+        self._surroundings = {}
+
+    @staticmethod
+    def __fingerprint(dataframe: pd.DataFrame) -> str:
+        from psyke.utils.dataframe import HashableDataFrame
+        return HashableDataFrame(dataframe).fingerprint
+
+    def check(self, dataframe: pd.DataFrame) -> None:
+        """
+        Ensures that a dataframe is the one the oracle has been built on, since the extractions provided with an oracle
+        are performed on the oracle's dataframe.
+
+        :param dataframe: the dataframe provided along with the oracle.
+        :raise ValueError: if the dataframe has different columns, instances or values.
+        """
+        if Oracle.__fingerprint(dataframe) != self._fingerprint:
+            raise ValueError('The dataframe does not match the one the oracle has been built on')
+
+    def predict(self, dataframe: pd.DataFrame):
+        positions = self.__positions(dataframe)
+        if positions is not None:
+            return self.predictions[positions]
+        if not self.__memoizable(dataframe):
+            return self.predictor.predict(dataframe)
+        memo = self.__memo()
+        keys = [row.tobytes() for row in dataframe.to_numpy()]
+        unseen = {}
+        for i, key in enumerate(keys):
+            if key not in memo and key not in unseen:
+                unseen[key] = i
+        if len(unseen) == 0:
+            return np.array([memo[key] for key in keys])
+        predicted = dict(zip(unseen, np.asarray(self.predictor.predict(dataframe.iloc[list(unseen.values())]))))
+        for key, prediction in list(predicted.items())[:max(self.max_samples - self._samples, 0)]:
+            memo[key] = prediction
+            self._samples += 1
+        return np.array([predicted[key] if key in predicted else memo[key] for key in keys])
+
+    def __positions(self, dataframe: pd.DataFrame) -> np.ndarray | None:
+        if not isinstance(dataframe, pd.DataFrame) or not self.dataframe.index.is_unique or \
+                list(dataframe.columns) != list(self.dataframe.columns[:-1]):
+            return None
+        positions = self.dataframe.index.get_indexer(dataframe.index)
+        if (positions < 0).any() or not np.array_equal(self.x[positions], dataframe.to_numpy()):
+            return None
+        return positions
+
+    def __memoizable(self, dataframe: pd.DataFrame) -> bool:
+        """
+        Instances are recognised by the bytes of their values, thus only numeric instances with the same columns and
+        representation of the dataframe ones are looked up.
+        """
+        return isinstance(dataframe, pd.DataFrame) and self.x.dtype.kind in 'biuf' and \
+            list(dataframe.columns) == list(self.dataframe.columns[:-1]) and \
+            all(dtype == self.x.dtype for dtype in dataframe.dtypes)
+
+    def __memo(self) -> dict[bytes, object]:
+        if self._memo is None:
+            self._memo = {row.tobytes(): prediction for row, prediction in zip(self.x, self.predictions)}
+        return self._memo
+
+    def surrounding_cube(self, closed: bool = False, output: Target = None):
+        """
+        Provides a new copy of the cube surrounding the dataframe instances.
+
+        :param closed: if the cube should include its upper bounds.
+        :param output: the output type of the cube.
+        :return: the surrounding cube.
+        """
+        from psyke.extraction.hypercubic import HyperCube
+        key = (closed, output)
+        if key not in self._surroundings:
+            self._surroundings[key] = HyperCube.create_surrounding_cube(self.dataframe, closed, output)
+        return self._surroundings[key].copy()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import math
 from typing import Callable
+import numpy as np
 from psyke.utils import get_int_precision
 
 
@@ -29,6 +30,13 @@ PRECISION = get_int_precision()
 STRING_PRECISION = str(PRECISION)
 
 
+def _values(other):
+    """
+    Turns arrays, pandas Series and other sequences into NumPy arrays, leaving scalars untouched.
+    """
+    return np.asarray(other) if np.ndim(other) > 0 else other
+
+
 class DiscreteFeature:
 
     def __init__(self, name: str, admissible_values: dict[str, Value]):
@@ -49,36 +57,43 @@ class Value:
     def __init__(self):
         pass
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
         """
         Check if a real number is inside an interval, or it is equal to a constant.
+        Arrays and pandas Series are checked element-wise.
 
-        :param other: the value to check
-        :return: true if the value is inside the interval, false otherwise
+        :param other: the value to check, or an array of values
+        :return: true if the value is inside the interval, false otherwise, or the boolean mask of the values
         """
-        return False
+        return np.zeros(np.shape(other), dtype=bool) if np.ndim(other) > 0 else False
 
-    def is_boundary(self, other: float) -> bool:
+    def is_boundary(self, other: float | np.ndarray) -> bool | np.ndarray:
         """
         Check if a real number is one edge of an interval, or it is equal to a constant.
+        Arrays and pandas Series are checked element-wise.
 
-        :param other: the value to check
-        :return: true if the value is one edge the interval, false otherwise
+        :param other: the value to check, or an array of values
+        :return: true if the value is one edge the interval, false otherwise, or the boolean mask of the values
         """
+        other = _values(other)
         if isinstance(self, Constant):
             return self.value == other
         elif isinstance(self, Interval):
-            return self.lower == other or self.upper == other
+            return (self.lower == other) | (self.upper == other) if np.ndim(other) > 0 else \
+                self.lower == other or self.upper == other
         else:
-            return False
+            return np.zeros(np.shape(other), dtype=bool) if np.ndim(other) > 0 else False
 
-    def is_in_or_is_boundary(self, other_value: float) -> bool:
+    def is_in_or_is_boundary(self, other_value: float | np.ndarray) -> bool | np.ndarray:
         """
         Check if a real number is in or is boundary for an interval, or for a constant.
+        Arrays and pandas Series are checked element-wise.
 
-        :param other_value: the value to check
-        :return: true if at least one condition is true, false otherwise
+        :param other_value: the value to check, or an array of values
+        :return: true if at least one condition is true, false otherwise, or the boolean mask of the values
         """
+        if np.ndim(other_value) > 0:
+            return self.is_in(other_value) | self.is_boundary(other_value)
         return self.is_in(other_value) or self.is_boundary(other_value)
 
     def __contains__(self, other: Value) -> bool:
@@ -434,7 +449,8 @@ class LessThan(Interval):
     def __init__(self, value: float, standard: bool = True):
         super().__init__(-math.inf, value, standard)
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
+        other = _values(other)
         return other <= self.upper if self.standard else other < self.upper
 
     @property
@@ -460,7 +476,8 @@ class GreaterThan(Interval):
     def __init__(self, value: float, standard: bool = True):
         super().__init__(value, math.inf, standard)
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
+        other = _values(other)
         return other > self.lower if self.standard else other >= self.lower
 
     @property
@@ -486,7 +503,11 @@ class Between(Interval):
     def __init__(self, lowerbound: float, upperbound: float, standard: bool = True):
         super().__init__(lowerbound, upperbound, standard)
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
+        other = _values(other)
+        if np.ndim(other) > 0:
+            return (self.lower <= other) & (other < self.upper) if self.standard else \
+                (self.lower < other) & (other <= self.upper)
         return self.lower <= other < self.upper if self.standard else self.lower < other <= self.upper
 
     def print(self) -> str:
@@ -504,7 +525,11 @@ class Outside(Interval):
     def __init__(self, lowerbound: float, upperbound: float, standard: bool = True):
         super().__init__(lowerbound, upperbound, standard)
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
+        other = _values(other)
+        if np.ndim(other) > 0:
+            return (other < self.lower) | (self.upper <= other) if self.standard else \
+                (other <= self.lower) | (self.upper < other)
         return other < self.lower or self.upper <= other if self.standard else other <= self.lower or self.upper < other
 
     def print(self) -> str:
@@ -524,7 +549,16 @@ class Constant(Value):
         super().__init__()
         self.value = round(value, get_int_precision())
 
-    def is_in(self, other: float) -> bool:
+    def is_in(self, other: float | np.ndarray) -> bool | np.ndarray:
+        """
+        Arrays are compared with the same tolerance of math.isclose, which is symmetric unlike np.isclose.
+        """
+        other = _values(other)
+        if np.ndim(other) > 0:
+            other = other.astype(float)
+            difference = np.abs(other - self.value)
+            return (other == self.value) | \
+                (np.isfinite(difference) & (difference <= 1e-09 * np.maximum(np.abs(other), abs(self.value))))
         return math.isclose(other, self.value)
 
     def print(self) -> str:
@@ -1,10 +1,17 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import sqlite3
 from abc import ABC
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 import numpy as np
 import pandas as pd
 
 from psyke.extraction.hypercubic import Grid
 from psyke.utils import Target
+from psyke.utils.dataframe import HashableDataFrame
 
 
 class Objective(Enum):
@@ -12,6 +19,67 @@ class Objective(Enum):
     DATA = 2
 
 
+def process_pool(n_jobs: int | None) -> ProcessPoolExecutor:
+    """
+    Creates the pool of processes running the parallel searches of the optimizers.
+    The JVM backing tuProlog does not survive a fork, so workers are spawned.
+
+    :param n_jobs: the number of worker processes, None to use all the CPUs.
+    :return: the pool of processes.
+    :raise ValueError: if n_jobs is not positive.
+    """
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError(f'n_jobs must be positive or None, got {n_jobs}')
+    return ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn'))
+
+
+class ResultStore:
+    """
+    A persistent store of the outcomes of the extractions performed by the optimizers, kept in a SQLite database.
+    Optimizers sharing a store skip the extractions already performed, so an interrupted search can be resumed and
+    a search can be repeated with different preferences (e.g., readability tradeoff) without extracting again.
+
+    Parameters
+    ----------
+    path : the path of the database file, created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with sqlite3.connect(self.path) as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, loss REAL, rules INTEGER)')
+
+    @staticmethod
+    def fingerprint(dataframe: pd.DataFrame) -> str:
+        return HashableDataFrame(dataframe).fingerprint
+
+    @staticmethod
+    def key(**kwargs) -> str:
+        return json.dumps(kwargs, sort_keys=True, default=str)
+
+    def get(self, key: str) -> tuple[float, int] | None:
+        """
+        Retrieves a stored result.
+
+        :param key: the key of the result.
+        :return: the predictive loss and the number of rules, or None if the result is not stored.
+        """
+        with sqlite3.connect(self.path) as connection:
+            row = connection.execute('SELECT loss, rules FROM results WHERE key = ?', (key,)).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def put(self, key: str, loss: float, rules: int) -> None:
+        """
+        Stores a result, replacing the one with the same key.
+
+        :param key: the key of the result.
+        :param loss: the predictive loss.
+        :param rules: the number of rules.
+        """
+        with sqlite3.connect(self.path) as connection:
+            connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)', (key, float(loss), int(rules)))
+
+
 class Optimizer:
     def __init__(self, dataframe: pd.DataFrame, output: Target = Target.CONSTANT, max_error_increase: float = 1.2,
                  min_rule_decrease: float = 0.9, readability_tradeoff: float = 0.1, patience: int = 5,
@@ -25,10 +93,23 @@ class Optimizer:
         self.params = None
         self.normalization = normalization
         self.discretization = discretization
+        self.store: ResultStore | None = None
 
     def search(self):
         raise NotImplementedError
 
+    def _stored(self, dataframe: pd.DataFrame, oracle, **kwargs) -> tuple[str | None, tuple[float, int] | None]:
+        if self.store is None:
+            return None, None
+        key = ResultStore.key(optimizer=type(self).__name__, data=ResultStore.fingerprint(dataframe),
+                              oracle=ResultStore.fingerprint(oracle.dataframe), output=self.output,
+                              normalization=self.normalization, **kwargs)
+        return key, self.store.get(key)
+
+    def _store(self, key: str | None, loss: float, rules: int) -> None:
+        if key is not None:
+            self.store.put(key, loss, rules)
+
     def _best(self, params):
         param_dict = {self._score(t): t for t in params}
         min_param = min(param_dict)
@@ -1,8 +1,13 @@
+import os
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
 from enum import Enum
+from itertools import islice
 
 import pandas as pd
 
-from psyke.tuning import Objective, SKEOptimizer
+from psyke import get_default_random_seed
+from psyke.tuning import Objective, SKEOptimizer, ResultStore, process_pool
 from psyke.tuning.orchid import OrCHiD
 from psyke.utils import Target
 
@@ -15,37 +20,91 @@ class CRASH(SKEOptimizer):
     def __init__(self, predictor, dataframe: pd.DataFrame, max_error_increase: float = 1.2,
                  min_rule_decrease: float = 0.9, readability_tradeoff: float = 0.1, max_depth: int = 10,
                  max_gauss_components: int = 5, patience: int = 5, output: Target = Target.CONSTANT,
-                 objective: Objective = Objective.MODEL, normalization=None, discretization=None):
+                 objective: Objective = Objective.MODEL, normalization=None, discretization=None, n_jobs: int = 1,
+                 store: ResultStore = None, seed: int = get_default_random_seed()):
         super().__init__(predictor, dataframe, max_error_increase, min_rule_decrease, readability_tradeoff,
                          patience, objective, output, normalization, discretization)
         self.max_depth = max_depth
         self.max_gauss_components = max_gauss_components
+        self.n_jobs = n_jobs
+        self.store = store
+        self.seed = seed
 
     def search(self):
-        self.params = []
-        for algorithm in [OrCHiD.Algorithm.ExACT, OrCHiD.Algorithm.CREAM]:
-            self.params += self.__search_algorithm(algorithm)
+        algorithms = [OrCHiD.Algorithm.ExACT, OrCHiD.Algorithm.CREAM]
+        components = range(2, self.max_gauss_components + 1)
+        if self.n_jobs == 1:
+            results = {algorithm: list(self.__search_algorithm(
+                self._search_components(algorithm, gauss_components) for gauss_components in components))
+                for algorithm in algorithms}
+        else:
+            with process_pool(self.n_jobs) as executor:
+                results = self.__search_concurrently(executor, algorithms, components)
+        self.params = [param for algorithm in algorithms for params in results[algorithm] for param in params]
 
-    def __search_algorithm(self, algorithm):
-        params = []
-        best = None
+    def __search_concurrently(self, executor, algorithms, components):
+        """
+        Searches the numbers of components of all the algorithms concurrently, with the same early stopping of the
+        serial search. The components of each algorithm are submitted gradually, keeping at most as many calls in
+        flight as the workers, and their results are consumed in order. When an algorithm stops, its queued calls
+        are cancelled, while its running calls cannot be interrupted: they hold their workers until completion and
+        their results are discarded.
+        """
+        results = {algorithm: [] for algorithm in algorithms}
+        if len(components) == 0:
+            return results
+        window = self.n_jobs or os.cpu_count() or 1
+        remaining = {algorithm: iter(components) for algorithm in algorithms}
+        futures = {algorithm: deque() for algorithm in algorithms}
+        best = {algorithm: None for algorithm in algorithms}
+
+        def submit(algorithm):
+            for gauss_components in islice(remaining[algorithm], window - len(futures[algorithm])):
+                futures[algorithm].append(executor.submit(self._search_components, algorithm, gauss_components))
 
-        for gauss_components in range(2, self.max_gauss_components + 1):
-            data = self.dataframe.sample(n=gauss_components * 100) if gauss_components * 100 < len(self.dataframe) \
-                else self.dataframe
-            current_params = self.__search_components(data, algorithm, gauss_components)
-            current_best = self._best(current_params)[1]
-            if best is not None and self._score(best) <= self._score(current_best):
+        for algorithm in algorithms:
+            submit(algorithm)
+        running = list(algorithms)
+        while len(running) > 0:
+            wait([futures[algorithm][0] for algorithm in running], return_when=FIRST_COMPLETED)
+            for algorithm in list(running):
+                if not futures[algorithm][0].done():
+                    continue
+                current_params = futures[algorithm].popleft().result()
+                if self.__worse(best[algorithm], current_params):
+                    for pending in futures[algorithm]:
+                        pending.cancel()
+                    running.remove(algorithm)
+                    continue
+                best[algorithm] = self._best(current_params)[1]
+                results[algorithm].append(current_params)
+                submit(algorithm)
+                if len(futures[algorithm]) == 0:
+                    running.remove(algorithm)
+        return results
+
+    def __search_algorithm(self, results):
+        best = None
+        for current_params in results:
+            if self.__worse(best, current_params):
                 break
-            best = current_best
-            params += current_params
+            best = self._best(current_params)[1]
+            yield current_params
 
-        return params
+    def __worse(self, best, current_params):
+        return best is not None and self._score(best) <= self._score(self._best(current_params)[1])
 
-    def __search_components(self, data, algorithm, gauss_components):
+    def _search_components(self, algorithm, gauss_components):
+        """
+        Searches an algorithm with a number of components on a subsample of gauss_components * 100 instances (or on
+        the whole dataframe, if smaller). Subsamples are drawn with the seed of the optimizer, so that the search does
+        not depend on the order in which the components are searched; a None seed draws them unseeded.
+        """
+        data = self.dataframe.sample(n=gauss_components * 100, random_state=self.seed) \
+            if gauss_components * 100 < len(self.dataframe) else self.dataframe
         orchid = OrCHiD(data, algorithm, self.output, self.max_error_increase, self.min_rule_decrease,
                         self.readability_tradeoff, self.patience, self.max_depth, gauss_components,
-                        self.normalization, self.discretization)
+                        self.normalization, self.discretization, self.store)
         orchid.search()
         return [(*p, gauss_components, algorithm) for p in orchid.params]
 
@@ -0,0 +1,52 @@
+import numpy as np
+
+from psyke import get_default_random_seed
+from psyke.oracle import Oracle
+from psyke.tuning import Optimizer
+
+
+class SuccessiveHalving(Optimizer):
+    """
+    Successive halving search over the parameters explored by a PEDRO or OrCHiD optimizer.
+    Every candidate is first evaluated on a small random subsample of the dataframe, then only the best 1 / eta of
+    the candidates are promoted to a subsample eta times larger, until the survivors are evaluated on the whole
+    dataframe. Candidates are ranked with the same combined score used by get_best.
+
+    Parameters
+    ----------
+    optimizer : the PEDRO or OrCHiD optimizer providing the candidates and their evaluation.
+    n_thresholds : the number of thresholds tried for each depth (and strategy).
+    eta : the inverse of the fraction of candidates promoted to the next budget.
+    min_examples : the size of the smallest subsample.
+    """
+
+    def __init__(self, optimizer, n_thresholds: int = 10, eta: int = 3, min_examples: int = 100,
+                 seed: int = get_default_random_seed()):
+        super().__init__(optimizer.dataframe, optimizer.output, optimizer.max_error_increase,
+                         optimizer.min_rule_decrease, optimizer.readability_tradeoff, optimizer.patience,
+                         optimizer.normalization, optimizer.discretization)
+        self.optimizer = optimizer
+        self.n_thresholds = n_thresholds
+        self.eta = eta
+        self.min_examples = min_examples
+        self.seed = seed
+
+    def search(self):
+        candidates = self.optimizer._candidates(self.n_thresholds)
+        n = len(self.dataframe)
+        rungs = int(np.floor(np.log(n / self.min_examples) / np.log(self.eta))) if n > self.min_examples else 0
+        order = np.random.default_rng(self.seed).permutation(n)
+        params = []
+        for rung in range(rungs, -1, -1):
+            size = int(np.ceil(n / self.eta ** rung))
+            print(f"Successive halving. {len(candidates)} candidates on {size} instances.")
+            sample = self.dataframe.iloc[np.sort(order[:size])]
+            oracle = self.optimizer.oracle if size == n else Oracle(self.optimizer.oracle, sample)
+            params = [self.optimizer._evaluate(candidate, sample, oracle) for candidate in candidates]
+            if rung > 0:
+                ranking = sorted(range(len(params)), key=lambda i: (self._score(params[i]), i))
+                candidates = [candidates[i] for i in sorted(ranking[:int(np.ceil(len(candidates) / self.eta))])]
+        self.params = params
+
+    def _print_params(self, name, params):
+        self.optimizer._print_params(name, params)
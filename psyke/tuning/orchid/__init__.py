@@ -4,7 +4,9 @@ import numpy as np
 import pandas as pd
 
 from psyke import Clustering, EvaluableModel
-from psyke.tuning import Optimizer, IterativeOptimizer
+from psyke.clustering.neighbors import KDTreeNearestNeighbor
+from psyke.oracle import Oracle
+from psyke.tuning import Optimizer, IterativeOptimizer, ResultStore
 from psyke.utils import Target
 
 
@@ -15,11 +17,14 @@ class OrCHiD(IterativeOptimizer):
 
     def __init__(self, dataframe: pd.DataFrame, algorithm, output: Target = Target.CONSTANT,
                  max_error_increase: float = 1.2, min_rule_decrease: float = 0.9, readability_tradeoff: float = 0.1,
-                 patience: int = 5, max_depth: int = 10, gauss_components=10, normalization=None, discretization=None):
+                 patience: int = 5, max_depth: int = 10, gauss_components=10, normalization=None, discretization=None,
+                 store: ResultStore = None):
         super().__init__(dataframe, max_error_increase, min_rule_decrease, readability_tradeoff, max_depth, patience,
                          output, normalization, discretization)
         self.algorithm = algorithm
         self.gauss_components = gauss_components
+        self.store = store
+        self.oracle = Oracle(KDTreeNearestNeighbor().fit(dataframe.iloc[:, :-1], dataframe.iloc[:, -1]), dataframe)
 
     def search(self):
         self.params = self.__search_depth()
@@ -41,21 +46,14 @@ class OrCHiD(IterativeOptimizer):
     def __search_threshold(self, depth):
         step = 1.0
         threshold = 1.0
-        params = []
+        params, base = [], None
         patience = self.patience
         while patience > 0:
             print(f"{self.algorithm}. Depth: {depth}. Threshold = {threshold:.2f}. "
                   f"Gaussian components = {self.gauss_components}. ", end="")
-            clustering = (Clustering.cream if self.algorithm == OrCHiD.Algorithm.CREAM else Clustering.exact)(
-                depth=depth, error_threshold=threshold, gauss_components=self.gauss_components, output=self.output
-            )
-            clustering.fit(self.dataframe)
-            task, metric = \
-                (EvaluableModel.Task.CLASSIFICATION, EvaluableModel.ClassificationScore.INVERSE_ACCURACY) \
-                if self.output == Target.CLASSIFICATION else \
-                (EvaluableModel.Task.REGRESSION, EvaluableModel.RegressionScore.MAE)
-            p, n = clustering.score(self.dataframe, None, False, False, task=task,
-                                    scoring_function=[metric])[metric][0], clustering.n_rules
+            (p, n, _, _), clustering = self._fit((depth, threshold), self.dataframe, self.oracle, base)
+            if clustering is not None and (base is None or clustering.error_threshold < base.error_threshold):
+                base = clustering
 
             print(f"Predictive loss = {p:.2f}, {n} rules")
 
@@ -81,6 +79,37 @@ class OrCHiD(IterativeOptimizer):
             threshold += step
         return params
 
+    def _fit(self, candidate, dataframe, oracle, base=None):
+        depth, threshold = candidate
+        key, stored = self._stored(dataframe, oracle, algorithm=self.algorithm.name, depth=depth, threshold=threshold,
+                                   gauss_components=self.gauss_components)
+        if stored is not None:
+            return (*stored, depth, threshold), None
+        if base is not None and base.error_threshold <= threshold:
+            # The tree fitted with a smaller threshold is pruned, instead of fitting Gaussians and DBSCAN again
+            clustering = base.pruned(threshold)
+        else:
+            clustering = (Clustering.cream if self.algorithm == OrCHiD.Algorithm.CREAM else Clustering.exact)(
+                depth=depth, error_threshold=threshold, gauss_components=self.gauss_components, output=self.output,
+                keep_tree=True
+            )
+            clustering.fit(dataframe, oracle)
+        task, metric = \
+            (EvaluableModel.Task.CLASSIFICATION, EvaluableModel.ClassificationScore.INVERSE_ACCURACY) \
+            if self.output == Target.CLASSIFICATION else \
+            (EvaluableModel.Task.REGRESSION, EvaluableModel.RegressionScore.MAE)
+        loss = clustering.score_report(dataframe, task=task, scoring_function=[metric])[metric][0]
+        self._store(key, loss, clustering.n_rules)
+        return (loss, clustering.n_rules, depth, threshold), clustering
+
+    def _evaluate(self, candidate, dataframe, oracle):
+        return self._fit(candidate, dataframe, oracle)[0]
+
+    def _candidates(self, n_thresholds):
+        p = self._evaluate((1, 1.0), self.dataframe, self.oracle)[0]
+        thresholds = [1.0] + [p / 20 + i * p / self.patience * 0.75 for i in range(n_thresholds - 1)]
+        return [(depth, threshold) for depth in range(1, self.max_depth + 1) for threshold in thresholds]
+
     def _print_params(self, name, params):
         print("*" * 40)
         print(f"* Best {name}")
@@ -4,10 +4,11 @@ from enum import Enum
 
 from sklearn.metrics import accuracy_score
 
-from psyke import Extractor, Target
+from psyke import Extractor, Target, EvaluableModel
+from psyke.oracle import Oracle
 from psyke.extraction.hypercubic import Grid, FeatureRanker
 from psyke.extraction.hypercubic.strategy import AdaptiveStrategy, FixedStrategy
-from psyke.tuning import Objective, IterativeOptimizer, SKEOptimizer
+from psyke.tuning import Objective, IterativeOptimizer, SKEOptimizer, ResultStore, process_pool
 
 
 class PEDRO(SKEOptimizer, IterativeOptimizer):
@@ -19,7 +20,8 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
     def __init__(self, predictor, dataframe: pd.DataFrame, max_error_increase: float = 1.2,
                  min_rule_decrease: float = 0.9, readability_tradeoff: float = 0.1, max_depth: int = 3,
                  patience: int = 3, algorithm: Algorithm = Algorithm.GRIDREX, objective: Objective = Objective.MODEL,
-                 output: Target = Target.CONSTANT, normalization=None, discretization=None):
+                 output: Target = Target.CONSTANT, normalization=None, discretization=None, n_jobs: int = 1,
+                 store: ResultStore = None):
         SKEOptimizer.__init__(self, predictor, dataframe, max_error_increase, min_rule_decrease,
                               readability_tradeoff, patience, objective, output, normalization, discretization)
         IterativeOptimizer.__init__(self, dataframe, max_error_increase, min_rule_decrease, readability_tradeoff,
@@ -29,16 +31,20 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
         self.algorithm_name = "GridREx" if algorithm == PEDRO.Algorithm.GRIDREX else \
             "GridEx" if algorithm == PEDRO.Algorithm.GRIDEX else "HEx"
         self.ranked = FeatureRanker(dataframe.columns[:-1]).fit(predictor, dataframe.iloc[:, :-1]).rankings()
-        predictions = self.predictor.predict(dataframe.iloc[:, :-1]).flatten()
+        self.oracle = Oracle(predictor, dataframe)
+        predictions = self.oracle.predictions.flatten()
         expected = self.dataframe.iloc[:, -1].values
         self.error = 1 - accuracy_score(predictions, expected) if output == Target.CLASSIFICATION else \
             abs(predictions - expected).mean()
+        self.n_jobs = n_jobs
+        self.store = store
 
     def _search_depth(self, strategy, critical, max_partitions):
-        params, best = [], None
+        params, best, states = [], None, {}
 
         for iterations in range(self.max_depth):
-            current_params = self.__search_threshold(Grid(iterations + 1, strategy), critical, max_partitions)
+            current_params, states = self.__search_threshold(Grid(iterations + 1, strategy), critical,
+                                                             max_partitions, states)
             current_best = self._best(current_params)[1]
             print()
             best, to_break = self._check_iteration_improvement(best, current_best)
@@ -48,20 +54,16 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
                 break
         return params
 
-    def __search_threshold(self, grid, critical, max_partitions):
+    def __search_threshold(self, grid, critical, max_partitions, states):
         step = self.error / 2.0
         threshold = self.error * 0.5
-        params = []
+        params, new_states = [], {}
         patience = self.patience
         while patience > 0:
             print("{}. {}. Threshold = {:.2f}. ".format(self.algorithm_name, grid, threshold), end="")
-            extractor = self.algorithm(self.predictor, grid, min_examples=25, output=self.output,
-                                       threshold=threshold, normalization=self.normalization)
-            _ = extractor.extract(self.dataframe)
-            error_function = (lambda *x: 1 - extractor.accuracy(*x)) if self.output == Target.CLASSIFICATION \
-                else extractor.mae
-            error, n = (error_function(self.dataframe, self.predictor) if self.objective == Objective.MODEL else
-                        error_function(self.dataframe)), extractor.n_rules
+            (error, n, _, _), extractor = self._extract((grid, threshold), self.dataframe, self.oracle,
+                                                         states.get(threshold))
+            new_states[threshold] = None if extractor is None else extractor.state
             print("MAE = {:.2f}, {} rules".format(error, n))
 
             if len(params) == 0:
@@ -89,7 +91,34 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
             if error != params[-1][0] or n != params[-1][1]:
                 params.append((error, n, threshold, grid))
             threshold += step
-        return params
+        return params, new_states
+
+    def _extract(self, candidate, dataframe, oracle, state=None):
+        grid, threshold = candidate
+        key, stored = self._stored(dataframe, oracle, algorithm=self.algorithm_name, objective=self.objective,
+                                   grid=[[grid.get(f, i) for f in dataframe.columns[:-1]] for i in grid.iterate()],
+                                   threshold=threshold)
+        if stored is not None:
+            return (*stored, threshold, grid), None
+        extractor = self.algorithm(self.predictor, grid, min_examples=25, output=self.output,
+                                   threshold=threshold, normalization=self.normalization)
+        _ = extractor.resume(state).extract(dataframe, oracle)
+        task, metric = \
+            (EvaluableModel.Task.CLASSIFICATION, EvaluableModel.ClassificationScore.INVERSE_ACCURACY) \
+            if self.output == Target.CLASSIFICATION else \
+            (EvaluableModel.Task.REGRESSION, EvaluableModel.RegressionScore.MAE)
+        error = extractor.score_report(dataframe, oracle if self.objective == Objective.MODEL else None,
+                                       task=task, scoring_function=[metric])[metric][-1]
+        self._store(key, error, extractor.n_rules)
+        return (error, extractor.n_rules, threshold, grid), extractor
+
+    def _evaluate(self, candidate, dataframe, oracle):
+        return self._extract(candidate, dataframe, oracle)[0]
+
+    def _candidates(self, n_thresholds):
+        thresholds = [self.error * 0.5 * (i + 1) for i in range(n_thresholds)]
+        return [(Grid(depth, strategy), threshold) for strategy in self._strategies()[0]
+                for depth in range(1, self.max_depth + 1) for threshold in thresholds]
 
     def __contains(self, strategies, strategy):
         for s in strategies:
@@ -97,7 +126,7 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
                 return True
         return False
 
-    def search(self):
+    def _strategies(self):
         max_partitions = 200
         base_partitions = FixedStrategy(2).partition_number(self.dataframe.columns[:-1]) * 3
         if base_partitions <= max_partitions:
@@ -120,18 +149,24 @@ class PEDRO(SKEOptimizer, IterativeOptimizer):
             if strategy.partition_number(self.dataframe.columns[:-1]) < base_partitions and \
                     not self.__contains(strategies, strategy):
                 strategies.append(strategy)
+        return strategies, base_partitions
 
+    def search(self):
+        strategies, base_partitions = self._strategies()
         avg = 0.
         for strategy in strategies:
             avg += strategy.partition_number(self.dataframe.columns[:-1])
         avg /= len(strategies)
 
-        params = []
-        for strategy in strategies:
-            params += self._search_depth(strategy,
-                                         strategy.partition_number(self.dataframe.columns[:-1]) > avg,
-                                         base_partitions)
-        self.params = params
+        arguments = [(strategy, strategy.partition_number(self.dataframe.columns[:-1]) > avg, base_partitions)
+                     for strategy in strategies]
+        if self.n_jobs == 1:
+            results = [self._search_depth(*args) for args in arguments]
+        else:
+            with process_pool(self.n_jobs) as executor:
+                results = [future.result() for future in
+                           [executor.submit(self._search_depth, *args) for args in arguments]]
+        self.params = [param for params in results for param in params]
 
     def _print_params(self, name, params):
         print("**********************")
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import sys
+import weakref
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+_DEFAULT_MAX_BYTES: int = 1 << 28
+
+
+class PredictionCache:
+    """
+    A least recently used cache of the predictions of black boxes, keyed by predictor identity and dataframe content.
+    The cache is bounded by the bytes of the cached predictions. Predictors must not be trained again while their
+    predictions are cached.
+
+    Parameters
+    ----------
+    max_bytes : the maximum amount of bytes of the cached predictions.
+    """
+
+    def __init__(self, max_bytes: int = _DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[tuple[int, str], tuple[weakref.ref | object, np.ndarray]] = OrderedDict()
+
+    def predict(self, predictor, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Provides the predictions of the predictor on the dataframe, querying the predictor only on cache misses.
+
+        :param predictor: the black box predictor.
+        :param dataframe: the instances to predict.
+        :return: the read-only array of predictions.
+        """
+        from psyke.utils.dataframe import HashableDataFrame
+        key = id(predictor), HashableDataFrame(dataframe).fingerprint
+        if key in self._entries:
+            reference, predictions = self._entries[key]
+            if PredictionCache.__dereference(reference) is predictor:
+                self._entries.move_to_end(key)
+                return predictions
+            self.__remove(key)
+        predictions = np.asarray(predictor.predict(dataframe))
+        predictions.flags.writeable = False
+        if predictions.nbytes <= self.max_bytes:
+            self._entries[key] = PredictionCache.__reference(predictor), predictions
+            self.nbytes += predictions.nbytes
+            while self.nbytes > self.max_bytes:
+                self.__remove(next(iter(self._entries)))
+        return predictions
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __remove(self, key: tuple[int, str]) -> None:
+        self.nbytes -= self._entries.pop(key)[1].nbytes
+
+    @staticmethod
+    def __reference(predictor):
+        try:
+            return weakref.ref(predictor)
+        except TypeError:
+            return predictor
+
+    @staticmethod
+    def __dereference(reference):
+        return reference() if isinstance(reference, weakref.ref) else reference
+
+
+class ExtractionCache:
+    """
+    A least recently used cache of the results of extractions, keyed by extractor identity and dataframe content.
+    Extractors are only weakly referenced: their results are dropped as soon as they are garbage collected.
+    The cache is bounded by the size of the results, as estimated by the extractors (by default, their shallow size).
+    If a path is provided, the results whose extractor can describe itself with a persistent key are also stored in
+    a SQLite database, so that they survive the session.
+
+    Parameters
+    ----------
+    max_bytes : the maximum amount of estimated bytes of the cached results.
+    path : the optional path of the database persisting the results.
+    """
+
+    def __init__(self, max_bytes: int = _DEFAULT_MAX_BYTES, path: str = None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.nbytes = 0
+        self._entries: OrderedDict[tuple[int, str], tuple[Any, int]] = OrderedDict()
+        self._owners: dict[int, weakref.ref | object] = {}
+        if path is not None:
+            with sqlite3.connect(path) as connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, result BLOB)')
+
+    def get_or_set(self, extractor, dataframe: pd.DataFrame, compute: Callable[[], Any],
+                   persistent_key: Callable[[], str] = None, size: Callable[[Any], int] = sys.getsizeof) -> Any:
+        """
+        Provides the result of an extraction, computing it only on cache misses.
+
+        :param extractor: the extractor owning the result.
+        :param dataframe: the dataframe the result is extracted from.
+        :param compute: the function computing the result.
+        :param persistent_key: the optional function describing the extractor across sessions, i.e. its class,
+            predictor and parameters. Without it, or if it returns None, the result is never persisted.
+        :param size: the function estimating the bytes of a result.
+        :return: the result of the extraction.
+        """
+        from psyke.utils.dataframe import HashableDataFrame
+        fingerprint = HashableDataFrame(dataframe).fingerprint
+        key = id(extractor), fingerprint
+        if key in self._entries and self.__dereference(self._owners.get(key[0])) is extractor:
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+        description = None if self.path is None or persistent_key is None else persistent_key()
+        stored = None
+        if description is not None:
+            stored = sha256(f'{type(extractor).__qualname__}:{description}:{fingerprint}'.encode()).hexdigest()
+            with sqlite3.connect(self.path) as connection:
+                row = connection.execute('SELECT result FROM extractions WHERE key = ?', (stored,)).fetchone()
+            if row is not None:
+                result = pickle.loads(row[0])
+                self.__insert(key, extractor, result, size(result))
+                return result
+        result = compute()
+        if stored is not None:
+            with sqlite3.connect(self.path) as connection:
+                connection.execute('INSERT OR REPLACE INTO extractions VALUES (?, ?)', (stored, pickle.dumps(result)))
+        self.__insert(key, extractor, result, size(result))
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._owners.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __insert(self, key: tuple[int, str], extractor, result, nbytes: int) -> None:
+        if key in self._entries:
+            self.__remove(key)
+        if self.__dereference(self._owners.get(key[0])) is not extractor:
+            self.__forget(key[0])
+            self._owners[key[0]] = self.__reference(extractor)
+        if nbytes <= self.max_bytes:
+            self._entries[key] = result, nbytes
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self.__remove(next(iter(self._entries)))
+
+    def __remove(self, key: tuple[int, str]) -> None:
+        self.nbytes -= self._entries.pop(key)[1]
+
+    def __forget(self, owner: int) -> None:
+        for key in [key for key in self._entries if key[0] == owner]:
+            self.__remove(key)
+        self._owners.pop(owner, None)
+
+    def __reference(self, extractor):
+        try:
+            return weakref.ref(extractor, lambda _, owner=id(extractor): self.__forget(owner))
+        except TypeError:
+            return extractor
+
+    @staticmethod
+    def __dereference(reference):
+        return reference() if isinstance(reference, weakref.ref) else reference
+
+
+_digests: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def predictor_digest(predictor) -> str | None:
+    """
+    Digests the pickled predictor, computing the digest only once per predictor. Predictors must not be trained again
+    after being digested.
+
+    :param predictor: the predictor to digest.
+    :return: the digest, or None if the predictor cannot be pickled (e.g., predictors wrapping native sessions).
+    """
+    try:
+        if predictor in _digests:
+            return _digests[predictor]
+    except TypeError:
+        pass
+    try:
+        digest = sha256(pickle.dumps(predictor)).hexdigest()
+    except (pickle.PicklingError, TypeError, AttributeError):
+        digest = None
+    try:
+        _digests[predictor] = digest
+    except TypeError:
+        pass
+    return digest
+
+
+_cache_options: dict = {'cache': None, 'extraction': ExtractionCache()}
+
+
+def enable_prediction_cache(max_bytes: int = _DEFAULT_MAX_BYTES) -> PredictionCache:
+    """
+    Shares a new prediction cache among scoring, pedagogical extraction and tuning.
+
+    :param max_bytes: the maximum amount of bytes of the cached predictions.
+    :return: the enabled cache.
+    """
+    _cache_options['cache'] = PredictionCache(max_bytes)
+    return _cache_options['cache']
+
+
+def disable_prediction_cache() -> None:
+    _cache_options['cache'] = None
+
+
+def get_prediction_cache() -> PredictionCache | None:
+    return _cache_options['cache']
+
+
+def cached_predict(predictor, dataframe: pd.DataFrame):
+    """
+    Predicts the dataframe with the predictor, through the prediction cache if it is enabled.
+    """
+    cache = _cache_options['cache']
+    return predictor.predict(dataframe) if cache is None else cache.predict(predictor, dataframe)
+
+
+def enable_extraction_cache(max_bytes: int = _DEFAULT_MAX_BYTES, path: str = None) -> ExtractionCache:
+    """
+    Shares a new extraction cache among the extractors supporting it, replacing the current one. An in-memory cache
+    with the default size is enabled by default.
+
+    :param max_bytes: the maximum amount of bytes of the cached results.
+    :param path: the optional path of the database persisting the results.
+    :return: the enabled cache.
+    """
+    _cache_options['extraction'] = ExtractionCache(max_bytes, path)
+    return _cache_options['extraction']
+
+
+def disable_extraction_cache() -> None:
+    _cache_options['extraction'] = None
+
+
+def get_extraction_cache() -> ExtractionCache | None:
+    return _cache_options['extraction']
+
+
+def cached_extraction(extractor, dataframe: pd.DataFrame, compute: Callable[[], Any],
+                      persistent_key: Callable[[], str] = None, size: Callable[[Any], int] = sys.getsizeof) -> Any:
+    """
+    Computes the result of an extraction, through the extraction cache if it is enabled.
+    """
+    cache = _cache_options['extraction']
+    return compute() if cache is None else cache.get_or_set(extractor, dataframe, compute, persistent_key, size)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import math
 from hashlib import sha256
 from typing import Iterable, List
+import numpy as np
 import pandas as pd
 from pandas.core.util.hashing import hash_pandas_object
 from pandas.api.types import is_string_dtype, is_numeric_dtype, is_integer_dtype
@@ -118,6 +119,7 @@ def get_discrete_dataset(dataset: pd.DataFrame, discrete_features: Iterable[Disc
     Therefore the new features are alphabetically sorted.
     This is not strictly necessary because internally those algorithms perform the sorting themself.
     However it is a good idea to have this same function returning the same result w.r.t. the inputs.
+    Each admissible value is evaluated over the whole original column at once into a preallocated matrix.
 
     :param dataset: the original dataset
     :param discrete_features: mapping for the features
@@ -127,17 +129,13 @@ def get_discrete_dataset(dataset: pd.DataFrame, discrete_features: Iterable[Disc
     columns_name = [key for feature in discrete_features for key, _ in feature.admissible_values.items()]
     if sort:
         columns_name = sorted(columns_name)
-    new_dataset = pd.DataFrame(columns=columns_name)
+    positions = {name: index for index, name in enumerate(columns_name)}
+    matrix = np.zeros((dataset.shape[0], len(columns_name)), dtype=np.uint8)
     for feature in discrete_features:
-        for index, value in enumerate(dataset[feature.name]):
-            for key, admissible_value in feature.admissible_values.items():
-                new_dataset.loc[index, key] = int(admissible_value.is_in(value))
-
-    for feature in discrete_features:
-        for new_feature in feature.admissible_values.keys():
-            new_dataset[new_feature] = new_dataset[new_feature].astype(str).astype(int)
-
-    return new_dataset
+        values = dataset[feature.name].to_numpy()
+        for key, admissible_value in feature.admissible_values.items():
+            matrix[:, positions[key]] = admissible_value.is_in(values)
+    return pd.DataFrame(matrix, columns=columns_name).astype(int)
 
 
 def get_scaled_dataset(dataset: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, tuple[float, float]]]:
@@ -160,9 +158,27 @@ class HashableDataFrame(pd.DataFrame):
         super().__init__(obj)
 
     def __hash__(self):
-        hash_value = sha256(hash_pandas_object(self, index=True).values)
-        hash_value = hash(hash_value.hexdigest())
-        return hash_value
+        return hash(self.fingerprint)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A digest of the dataframe content which, unlike its hash, is stable across interpreter sessions.
+        The digest is updated incrementally with the raw buffer of the index and of each column, so no intermediate
+        copy of the dataframe is built. Only non-numeric columns are hashed element-wise.
+        """
+        digest = sha256(repr((list(self.columns), [str(dtype) for dtype in self.dtypes], self.shape)).encode())
+        digest.update(HashableDataFrame.__buffer(self.index))
+        for _, column in self.items():
+            digest.update(HashableDataFrame.__buffer(column))
+        return digest.hexdigest()
+
+    @staticmethod
+    def __buffer(values) -> memoryview:
+        array = np.asarray(values)
+        if array.dtype.kind not in 'biufcmM':
+            array = hash_pandas_object(pd.Series(array), index=False).values
+        return np.ascontiguousarray(array).data
 
     def __eq__(self, other):
         return self.equals(other)
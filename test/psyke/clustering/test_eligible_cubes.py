@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from psyke import Clustering
+from psyke.clustering.exact import ExACT
+from psyke.extraction.hypercubic import HyperCube
+from psyke.utils import Target
+from test.psyke.tuning import get_step_dataset
+
+
+class TestEligibleCubes(unittest.TestCase):
+
+    dataframe = get_step_dataset(60)
+
+    def frames(self):
+        labels = np.where(self.dataframe.Z > 1, 'high', 'low')
+        yield Target.CONSTANT, self.dataframe
+        yield Target.REGRESSION, self.dataframe
+        yield Target.CLASSIFICATION, self.dataframe.assign(Z=labels)
+
+    @staticmethod
+    def cubes(dataframe, output):
+        halves = [dataframe[dataframe.X > .5], dataframe[dataframe.Y < .3], dataframe.iloc[:1],
+                  dataframe.iloc[[0, 1, 2, 30]]]
+        return [HyperCube.create_surrounding_cube(data, True, output) for data in halves] + \
+            [HyperCube.create_surrounding_cube(dataframe, True, output)]
+
+    def test_masks(self):
+        for output, dataframe in self.frames():
+            cubes = self.cubes(dataframe, output)
+            masks = ExACT._masks(cubes, dataframe)
+            indices = ExACT._indices(cubes, dataframe)
+            for cube, mask, index in zip(cubes, masks, indices):
+                expected = cube.filter_indices(dataframe.iloc[:, :-1])
+                self.assertEqual(expected.tolist(), mask.tolist())
+                if expected.all() or not expected.any():
+                    self.assertIsNone(index)
+                else:
+                    self.assertEqual(expected.tolist(), index.tolist())
+
+    def test_diversities(self):
+        for output, dataframe in self.frames():
+            for factory in [Clustering.exact, Clustering.cream]:
+                clustering = factory(output=output)
+                oracle = clustering.create_oracle(dataframe)
+                cubes = self.cubes(dataframe, output)
+                splits = [(cube, mask) for cube, mask in zip(cubes, ExACT._indices(cubes, dataframe))
+                          if mask is not None]
+                masks = np.array([mask for _, mask in splits])
+                predictions = oracle.predict(dataframe.iloc[:, :-1])
+                diversities = clustering._diversities(np.concatenate([masks, ~masks]), dataframe, predictions)
+                outer = HyperCube.create_surrounding_cube(dataframe, True, output)
+                expected = []
+                for cube, data in [(cube, dataframe.iloc[mask]) for cube, mask in splits] + \
+                                  [(outer, dataframe.iloc[~mask]) for _, mask in splits]:
+                    cube = cube.copy()
+                    cube.update(data, oracle.predictor)
+                    expected.append(cube.diversity)
+                self.assertEqual(len(expected), len(diversities))
+                for value, expected_value in zip(diversities, expected):
+                    self.assertAlmostEqual(expected_value, value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from sklearn.neighbors import KNeighborsRegressor
+from psyke.clustering.neighbors import KDTreeNearestNeighbor, RandomProjectionForest
+from psyke.utils import get_default_random_seed
+
+
+class TestNeighbors(unittest.TestCase):
+
+    generator = np.random.default_rng(get_default_random_seed())
+    x = generator.uniform(size=(500, 5))
+    y = x.sum(axis=1)
+    queries = generator.uniform(size=(100, 5))
+
+    def test_kd_tree(self):
+        expected = KNeighborsRegressor(n_neighbors=1).fit(self.x, self.y).predict(self.queries)
+        self.assertTrue(all(expected == KDTreeNearestNeighbor().fit(self.x, self.y).predict(self.queries)))
+
+    def test_random_projection_forest(self):
+        forest = RandomProjectionForest(n_trees=3, leaf_size=10).fit(self.x, self.y)
+        self.assertTrue(all(self.y == forest.predict(self.x)))
+        exact = KDTreeNearestNeighbor().fit(self.x, self.y).predict(self.queries)
+        recall = [np.mean(RandomProjectionForest(n_trees=n, leaf_size=10).fit(self.x, self.y).predict(self.queries)
+                          == exact) for n in [1, 20]]
+        self.assertTrue(recall[0] <= recall[1])
+        self.assertTrue(recall[1] > .9)
+
+    def test_duplicates(self):
+        x = np.concatenate([np.full((2000, 5), .5), self.generator.uniform(size=(2000, 5))])
+        y = x.sum(axis=1)
+        forest = RandomProjectionForest(n_trees=5).fit(x, y)
+        for *_, offsets in forest._trees:
+            self.assertTrue(np.diff(offsets).max() <= forest.leaf_size)
+        self.assertTrue(all(y == forest.predict(x)))
+        exact = KDTreeNearestNeighbor().fit(x, y).predict(self.queries)
+        self.assertTrue(np.mean(forest.predict(self.queries) == exact) > .9)
+
+    def test_empty_query(self):
+        self.assertEqual(0, len(RandomProjectionForest().fit(self.x, self.y).predict(self.queries[:0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
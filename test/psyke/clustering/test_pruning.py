@@ -0,0 +1,31 @@
+import unittest
+from psyke import Clustering
+from test.psyke.tuning import get_step_dataset
+
+
+class TestPruning(unittest.TestCase):
+
+    dataframe = get_step_dataset(300)
+
+    def test_pruned(self):
+        for factory in [Clustering.exact, Clustering.cream]:
+            clustering = factory(depth=3, error_threshold=.01, gauss_components=3, keep_tree=True)
+            clustering.fit(self.dataframe)
+            same = clustering.pruned(.01)
+            self.assertEqual([cube.dimensions for cube in clustering.get_hypercubes()],
+                             [cube.dimensions for cube in same.get_hypercubes()])
+            rules = [clustering.pruned(threshold).n_rules for threshold in [.01, .05, .1, .5, 10.]]
+            self.assertEqual(sorted(rules, reverse=True), rules)
+            self.assertEqual(2, rules[-1])
+            self.assertRaises(ValueError, clustering.pruned, .001)
+
+    def test_unkept_tree(self):
+        for factory in [Clustering.exact, Clustering.cream]:
+            clustering = factory(depth=3, error_threshold=.01, gauss_components=3)
+            clustering.fit(self.dataframe)
+            self.assertEqual({}, clustering._unsplit)
+            self.assertRaises(ValueError, clustering.pruned, .05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.tree import DecisionTreeClassifier
+from psyke.extraction.cart.predictor import CartPredictor
+from psyke.utils import get_default_random_seed
+
+
+class TestCartPredictor(unittest.TestCase):
+
+    x, y = load_iris(return_X_y=True, as_frame=True)
+
+    def fitted(self, depth):
+        predictor = CartPredictor(DecisionTreeClassifier(max_depth=depth, random_state=get_default_random_seed()))
+        predictor.predictor.fit(self.x, self.y)
+        return predictor
+
+    def test_leaves(self):
+        predictor = self.fitted(4)
+        self.assertEqual(predictor.predictor.get_n_leaves(), predictor.n_leaves)
+        for constraints, prediction in predictor:
+            mask = np.ones(len(self.x), dtype=bool)
+            for feature, values in constraints.items():
+                for value in values:
+                    mask &= np.array([value.is_in(v) for v in self.x[feature]])
+            self.assertTrue(mask.any())
+            self.assertTrue(all(predictor.predict(self.x[mask]) == prediction))
+
+    def test_explain(self):
+        predictor = self.fitted(4)
+        explanations = predictor.explain(self.x)
+        self.assertEqual(len(self.x), len(explanations))
+        self.assertTrue(all(predictor.predict(self.x) == [prediction for _, prediction in explanations]))
+        for (_, row), (constraints, _) in zip(self.x.iterrows(), explanations):
+            self.assertTrue(all(value.is_in(row[feature])
+                                for feature, values in constraints.items() for value in values))
+
+    def test_refit(self):
+        predictor = self.fitted(1)
+        self.assertEqual(2, predictor.n_leaves)
+        predictor.predictor.set_params(max_depth=3).fit(self.x, self.y)
+        self.assertEqual(predictor.predictor.get_n_leaves(), predictor.n_leaves)
+
+    def test_constraints_are_copied(self):
+        predictor = self.fitted(2)
+        for constraints, _ in predictor:
+            constraints.clear()
+        self.assertTrue(all(len(constraints) > 0 for constraints, _ in predictor))
+
+
+if __name__ == '__main__':
+    unittest.main()
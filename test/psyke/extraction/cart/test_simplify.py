@@ -0,0 +1,54 @@
+import unittest
+from psyke.extraction.cart import Cart
+from psyke.schema import LessThan, GreaterThan, Between
+
+
+class TestSimplifyNodes(unittest.TestCase):
+
+    def test_shared_conditions(self):
+        nodes = [({'X': [LessThan(1.)], 'Y': [LessThan(2.)]}, 'a'),
+                 ({'X': [GreaterThan(1.)], 'Y': [LessThan(2.)]}, 'b'),
+                 ({'X': [GreaterThan(1.)], 'Y': [Between(2., 3.)]}, 'c'),
+                 ({'X': [GreaterThan(1.)], 'Y': [GreaterThan(3.)]}, 'd')]
+        expected = [({'X': [LessThan(1.)], 'Y': [LessThan(2.)]}, 'a'),
+                    ({'Y': [LessThan(2.)]}, 'b'),
+                    ({'Y': [Between(2., 3.)]}, 'c'),
+                    ({}, 'd')]
+        self.assertEqual(expected, Cart._simplify_nodes(nodes))
+
+    def test_partially_shared_conditions(self):
+        nodes = [({'X': [LessThan(1.)]}, 'a'),
+                 ({'X': [LessThan(2.)], 'Y': [LessThan(1.)]}, 'b'),
+                 ({'X': [LessThan(2.)], 'Y': [GreaterThan(1.)]}, 'c'),
+                 ({'X': [GreaterThan(2.)]}, 'd')]
+        expected = [({'X': [LessThan(1.)]}, 'a'),
+                    ({'X': [LessThan(2.)], 'Y': [LessThan(1.)]}, 'b'),
+                    ({'X': [LessThan(2.)], 'Y': [GreaterThan(1.)]}, 'c'),
+                    ({}, 'd')]
+        self.assertEqual(expected, Cart._simplify_nodes(nodes))
+
+    def test_adjacent_shared_conditions(self):
+        nodes = [({'X': [LessThan(1.)]}, 'a'),
+                 ({'X': [GreaterThan(1.), LessThan(3.)], 'Y': [LessThan(2.)]}, 'b'),
+                 ({'X': [GreaterThan(1.), LessThan(3.), LessThan(3.)], 'Y': [GreaterThan(2.)]}, 'c'),
+                 ({'X': [GreaterThan(1.), LessThan(3.), LessThan(3.)]}, 'd')]
+        expected = [({'X': [LessThan(1.)]}, 'a'),
+                    ({'Y': [LessThan(2.)]}, 'b'),
+                    ({'Y': [GreaterThan(2.)]}, 'c'),
+                    ({}, 'd')]
+        self.assertEqual(expected, Cart._simplify_nodes(nodes))
+
+    def test_repeated_conditions(self):
+        nodes = [({}, 'a'),
+                 ({'X': [LessThan(3.), LessThan(3.)]}, 'b'),
+                 ({'X': [LessThan(3.)], 'Y': [LessThan(1.)]}, 'c'),
+                 ({'X': [LessThan(3.)]}, 'd')]
+        expected = [({}, 'a'),
+                    ({'X': [LessThan(3.)]}, 'b'),
+                    ({'Y': [LessThan(1.)]}, 'c'),
+                    ({}, 'd')]
+        self.assertEqual(expected, Cart._simplify_nodes(nodes))
+
+
+if __name__ == '__main__':
+    unittest.main()
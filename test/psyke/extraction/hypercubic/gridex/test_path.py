@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_iris
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from psyke import Extractor, Target
+from psyke.extraction.hypercubic import Grid
+from psyke.extraction.hypercubic.strategy import FixedStrategy
+from psyke.utils import get_default_random_seed
+from psyke.utils.logic import pretty_theory
+
+
+class TestPath(unittest.TestCase):
+
+    x, y = load_iris(return_X_y=True, as_frame=True)
+    dataframe = x.join(pd.Series(y, name='target').astype(str))
+    predictor = KNeighborsClassifier(n_neighbors=7).fit(x, dataframe.target)
+    thresholds = [.3, .05, .1]
+
+    def test_extract_path(self):
+        extractor = Extractor.gridex(self.predictor, Grid(2, FixedStrategy(2)), min_examples=10, threshold=.1,
+                                     output=Target.CLASSIFICATION)
+        theories = extractor.extract_path(self.dataframe, self.thresholds)
+        self.assertEqual(len(self.thresholds), len(theories))
+        self.assertEqual(self.thresholds, [e.threshold for e in extractor.path])
+        for theory, path_extractor in zip(theories, extractor.path):
+            self.assertEqual(len(theory.clauses), path_extractor.n_rules)
+            self.assertTrue(path_extractor.accuracy(self.dataframe) > .5)
+        self.assertTrue(extractor.path[1].n_rules >= extractor.path[0].n_rules)
+
+    def test_separate_extractions(self):
+        generator = np.random.default_rng(get_default_random_seed())
+        x = pd.DataFrame(generator.uniform(size=(300, 3)), columns=['X', 'Y', 'Z'])
+        dataframe = x.assign(W=np.where(x.X > .5, 1., 0.) + .5 * x.Y * x.Z)
+        predictor = KNeighborsRegressor(n_neighbors=5).fit(x, dataframe.W)
+        thresholds = [.2, .05, .1, .02]
+        # Without synthetic samples, the shared split tree gives the theories of separate extractions too
+        cases = [(Extractor.gridex, 30, {'share_samples': False}), (Extractor.gridex, 0, {}),
+                 (Extractor.hex, 30, {'share_samples': False}), (Extractor.hex, 0, {})]
+        for algorithm, min_examples, options in cases:
+            extractor = algorithm(predictor, Grid(2, FixedStrategy(2)), min_examples=min_examples, threshold=.1)
+            theories = extractor.extract_path(dataframe, thresholds, **options)
+            for threshold, theory in zip(thresholds, theories):
+                separate = algorithm(predictor, Grid(2, FixedStrategy(2)), min_examples=min_examples,
+                                     threshold=threshold).extract(dataframe)
+                self.assertEqual(pretty_theory(separate), pretty_theory(theory))
+
+
+if __name__ == '__main__':
+    unittest.main()
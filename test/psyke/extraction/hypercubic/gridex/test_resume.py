@@ -0,0 +1,39 @@
+import unittest
+import pandas as pd
+from sklearn.datasets import load_iris
+from sklearn.neighbors import KNeighborsClassifier
+from psyke import Extractor, Target
+from psyke.extraction.hypercubic import Grid
+from psyke.extraction.hypercubic.strategy import FixedStrategy
+from psyke.utils.logic import pretty_theory
+
+
+class TestResume(unittest.TestCase):
+
+    x, y = load_iris(return_X_y=True, as_frame=True)
+    dataframe = x.join(pd.Series(y, name='target').astype(str))
+    predictor = KNeighborsClassifier(n_neighbors=7).fit(x, dataframe.target)
+
+    def __extract(self, factory, depth, state=None):
+        extractor = factory(self.predictor, Grid(depth, FixedStrategy(2)), min_examples=10, threshold=.1,
+                            output=Target.CLASSIFICATION).resume(state)
+        return extractor, pretty_theory(extractor.extract(self.dataframe))
+
+    def test_resume(self):
+        for factory in [Extractor.gridex, Extractor.hex]:
+            shallow, _ = self.__extract(factory, 1)
+            _, expected = self.__extract(factory, 2)
+            _, resumed = self.__extract(factory, 2, shallow.state)
+            self.assertEqual(expected, resumed)
+            _, resumed_again = self.__extract(factory, 2, shallow.state)
+            self.assertEqual(expected, resumed_again)
+
+    def test_incompatible_state(self):
+        shallow, _ = self.__extract(Extractor.gridex, 1)
+        extractor = Extractor.gridex(self.predictor, Grid(2, FixedStrategy(3)), min_examples=10, threshold=.1,
+                                     output=Target.CLASSIFICATION).resume(shallow.state)
+        self.assertRaises(ValueError, extractor.extract, self.dataframe)
+
+
+if __name__ == '__main__':
+    unittest.main()
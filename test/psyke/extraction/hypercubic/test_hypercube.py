@@ -177,6 +177,15 @@ class TestHypercube(AbstractTestHypercube):
         self.assertEqual(self.cube.output, predictions.mean())
         self.assertEqual(self.cube.diversity, predictions.std())
 
+    def test_update_with_predictions(self):
+        model = KNeighborsRegressor()
+        model.fit(self.dataset.iloc[:, :-1], self.dataset.iloc[:, -1])
+        other_cube = self.cube.copy()
+        self.cube.update(self.dataset, Predictor(model))
+        other_cube.update_with_predictions(self.dataset, model.predict(self.dataset.iloc[:, :-1]))
+        self.assertEqual(self.cube.output, other_cube.output)
+        self.assertEqual(self.cube.diversity, other_cube.diversity)
+
     def test_update_dimension(self):
         new_lower, new_upper = 0.6, 1.4
         updated = {'X': (new_lower, new_upper),
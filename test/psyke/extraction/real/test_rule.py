@@ -1,5 +1,6 @@
 import unittest
-from psyke.extraction.real.utils import Rule
+import numpy as np
+from psyke.extraction.real.utils import Rule, IndexedRuleSet
 from psyke.utils.dataframe import split_features
 from test import get_dataset
 
@@ -26,6 +27,26 @@ class TestRule(unittest.TestCase):
         self.assertFalse(rule_5 in rule_1)
         self.assertTrue(rule_1 in Rule([], []))
 
+    def test_masks(self):
+        columns = {'V1': 0, 'V2': 1, 'V3': 2, 'V4': 3, 'V5': 4}
+        rule = Rule(['V1'], ['V3'], columns)
+        self.assertEqual((0b1, 0b100), (rule.true_mask, rule.false_mask))
+        self.assertTrue(Rule(['V1', 'V2'], ['V3', 'V4'], columns) in rule)
+        self.assertFalse(rule in Rule(['V1', 'V2'], ['V3', 'V4'], columns))
+        self.assertFalse(Rule(['V1'], ['V5'], columns) in rule)
+        self.assertTrue(rule.covers(Rule.masks(np.array([[1, 1, 0, 0, 0]]))[0]))
+        self.assertFalse(rule.covers(Rule.masks(np.array([[1, 0, 1, 0, 0]]))[0]))
+
+    def test_coverage(self):
+        columns = {'V1': 0, 'V2': 1, 'V3': 2}
+        ruleset = IndexedRuleSet({0: [Rule(['V1'], [], columns)], 1: [Rule([], ['V1', 'V3'], columns)]})
+        data = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+        self.assertTrue((np.array([[True, False], [False, True], [False, False]]) == ruleset.coverage(data)).all())
+        masks = Rule.masks(data)
+        self.assertTrue((ruleset.coverage(data) ==
+                         [[rule.covers(mask) for _, rule in ruleset.flatten()] for mask in masks]).all())
+        self.assertEqual((3, 0), IndexedRuleSet({0: []}).coverage(data).shape)
+
     def test_reduce(self):
         dataset = get_dataset('iris')
         features = split_features(dataset)
@@ -1,6 +1,7 @@
 from psyke.extraction.trepan import Node, Split
 from test import get_dataset
 import math
+import numpy as np
 import pandas as pd
 import unittest
 
@@ -22,6 +23,14 @@ class TestSplit(unittest.TestCase):
                                      Split(self.all_node, (self.versicolor_25, self.versicolor_25_complementar))
                                      .priority))
 
+    def test_priorities(self):
+        splits = [Split(self.all_node, (self.setosa_40, self.setosa_40_complementar)),
+                  Split(self.all_node, (self.versicolor_25, self.versicolor_25_complementar))]
+        counts = [np.array([[sum(split.children[i].samples.iloc[:, -1] == c) for c in self.all_node.classes]
+                            for split in splits]) for i in range(2)]
+        priorities = Split.priorities(self.all_node, *counts)
+        self.assertEqual([split.priority for split in splits], list(priorities))
+
 
 if __name__ == '__main__':
     unittest.main()
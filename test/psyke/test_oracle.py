@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KNeighborsRegressor
+from psyke import Extractor
+from psyke.extraction.hypercubic import Grid
+from psyke.extraction.hypercubic.strategy import FixedStrategy
+from psyke.oracle import Oracle
+from psyke.utils import get_default_random_seed
+from psyke.utils.logic import pretty_theory
+
+
+class CountingRegressor(KNeighborsRegressor):
+
+    rows = 0
+
+    def predict(self, x):
+        CountingRegressor.rows += len(x)
+        return super().predict(x)
+
+
+class TestOracle(unittest.TestCase):
+
+    generator = np.random.default_rng(get_default_random_seed())
+    dataframe = pd.DataFrame(generator.uniform(size=(100, 3)), columns=['X', 'Y', 'Z'])
+    predictor = KNeighborsRegressor(n_neighbors=3).fit(dataframe.iloc[:, :-1], dataframe.iloc[:, -1])
+    oracle = Oracle(predictor, dataframe)
+
+    def test_dataframe(self):
+        self.assertEqual(list(self.dataframe.columns), list(self.oracle.dataframe.columns))
+        self.assertTrue(all(self.oracle.dataframe.iloc[:, :-1] == self.dataframe.iloc[:, :-1]))
+        self.assertTrue(np.allclose(self.oracle.dataframe.iloc[:, -1],
+                                    self.predictor.predict(self.dataframe.iloc[:, :-1])))
+
+    def test_predict(self):
+        subset = self.dataframe.iloc[10:40, :-1]
+        self.assertTrue(np.allclose(self.predictor.predict(subset), self.oracle.predict(subset)))
+        unseen = pd.DataFrame(self.generator.uniform(size=(20, 2)), columns=['X', 'Y'])
+        self.assertTrue(np.allclose(self.predictor.predict(unseen), self.oracle.predict(unseen)))
+        shuffled = subset.copy()
+        shuffled.iloc[:, :] = shuffled.to_numpy()[::-1]
+        self.assertTrue(np.allclose(self.predictor.predict(shuffled), self.oracle.predict(shuffled)))
+
+    def test_memo(self):
+        predictor = CountingRegressor(n_neighbors=3).fit(self.dataframe.iloc[:, :-1], self.dataframe.iloc[:, -1])
+        oracle = Oracle(predictor, self.dataframe, max_samples=15)
+        unseen = pd.DataFrame(self.generator.uniform(size=(20, 2)), columns=['X', 'Y'])
+        mixed = pd.concat([unseen.iloc[:10], self.dataframe.iloc[:10, :-1], unseen.iloc[:10]], ignore_index=True)
+        CountingRegressor.rows = 0
+        self.assertTrue(np.array_equal(predictor.predict(mixed), oracle.predict(mixed)))
+        self.assertEqual(10 + 30, CountingRegressor.rows)
+        CountingRegressor.rows = 0
+        self.assertTrue(np.array_equal(predictor.predict(unseen), oracle.predict(unseen)))
+        self.assertEqual(20 + 10, CountingRegressor.rows)
+        CountingRegressor.rows = 0
+        oracle.predict(unseen)
+        self.assertEqual(5, CountingRegressor.rows)
+
+    def test_shared_extractions(self):
+        predictor = CountingRegressor(n_neighbors=3).fit(self.dataframe.iloc[:, :-1], self.dataframe.iloc[:, -1])
+        oracle = Oracle(predictor, self.dataframe)
+        for algorithm in [Extractor.gridex, Extractor.hex]:
+            theories = []
+            for _ in range(2):
+                CountingRegressor.rows = 0
+                extractor = algorithm(predictor, Grid(2, FixedStrategy(2)), min_examples=20, threshold=.05)
+                theories.append(pretty_theory(extractor.extract(self.dataframe, oracle)))
+            self.assertEqual(0, CountingRegressor.rows)
+            separate = algorithm(predictor, Grid(2, FixedStrategy(2)), min_examples=20, threshold=.05)
+            self.assertEqual(theories[0], pretty_theory(separate.extract(self.dataframe)))
+            self.assertEqual(theories[0], theories[1])
+
+    def test_surrounding_cube(self):
+        cube = self.oracle.surrounding_cube()
+        cube.update_dimension('X', -1., 2.)
+        self.assertNotEqual(cube.dimensions['X'], self.oracle.surrounding_cube().dimensions['X'])
+
+    def test_check(self):
+        self.oracle.check(self.dataframe)
+        extractor = Extractor.cart(self.predictor, max_depth=2)
+        changed = self.dataframe.copy()
+        changed.iloc[3, 0] += 1e-9
+        for dataframe in [self.dataframe.iloc[:50], self.dataframe.rename(columns={'Z': 'W'}), changed]:
+            self.assertRaises(ValueError, self.oracle.check, dataframe)
+            self.assertRaises(ValueError, extractor.extract, dataframe, self.oracle)
+
+
+if __name__ == '__main__':
+    unittest.main()
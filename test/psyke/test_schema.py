@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+import pandas as pd
+from psyke.schema import LessThan, GreaterThan, Between, Outside, Constant
+
+
+class TestValue(unittest.TestCase):
+
+    values = [LessThan(1.), LessThan(1., False), GreaterThan(1.), GreaterThan(1., False), Between(1., 2.),
+              Between(1., 2., False), Outside(1., 2.), Outside(1., 2., False), Constant(1.), Constant(0.)]
+    samples = np.array([-np.inf, 0., 1e-12, 0.5, 1., 1. + 1e-12, 1.5, 2., 2.5, np.inf, np.nan])
+
+    def test_is_in(self):
+        for value in self.values:
+            expected = [value.is_in(sample) for sample in self.samples]
+            self.assertTrue(all(isinstance(result, (bool, np.bool_)) for result in expected))
+            for samples in [self.samples, pd.Series(self.samples, index=range(10, 21)), list(self.samples)]:
+                mask = value.is_in(samples)
+                self.assertIsInstance(mask, np.ndarray)
+                self.assertEqual(bool, mask.dtype)
+                self.assertEqual(expected, mask.tolist())
+
+    def test_is_in_or_is_boundary(self):
+        for value in self.values:
+            expected = [bool(value.is_in_or_is_boundary(sample)) for sample in self.samples]
+            self.assertEqual(expected, value.is_in_or_is_boundary(self.samples).tolist())
+
+    def test_integer_arrays(self):
+        samples = np.arange(-1, 4)
+        for value in self.values:
+            self.assertEqual([value.is_in(sample) for sample in samples], value.is_in(samples).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from psyke import EvaluableModel
+from psyke.utils import get_default_random_seed
+
+
+class Shifted(EvaluableModel):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def _predict(self, dataframe: pd.DataFrame):
+        self.calls += 1
+        return [None if x < .05 else x + .1 for x in dataframe.iloc[:, 0]]
+
+
+class TestScoreReport(unittest.TestCase):
+
+    generator = np.random.default_rng(get_default_random_seed())
+    dataframe = pd.DataFrame(generator.uniform(size=(100, 2)), columns=['X', 'Y'])
+
+    def test_report(self):
+        model = Shifted()
+        report = model.score_report(self.dataframe, task=EvaluableModel.Task.REGRESSION)
+        idx = self.dataframe.X >= .05
+        true, predicted = self.dataframe.Y[idx], self.dataframe.X[idx] + .1
+        self.assertAlmostEqual(idx.mean(), report.completeness)
+        for score, function in zip([EvaluableModel.RegressionScore.MAE, EvaluableModel.RegressionScore.MSE,
+                                    EvaluableModel.RegressionScore.R2],
+                                   [mean_absolute_error, mean_squared_error, r2_score]):
+            self.assertAlmostEqual(function(true, predicted), report[score][0])
+        model.score(self.dataframe, task=EvaluableModel.Task.REGRESSION,
+                    scoring_function=[EvaluableModel.RegressionScore.MAE])
+        self.assertEqual(1, model.calls)
+        model.score(self.dataframe.iloc[:50], task=EvaluableModel.Task.REGRESSION,
+                    scoring_function=[EvaluableModel.RegressionScore.MAE])
+        self.assertEqual(2, model.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KNeighborsRegressor
+from psyke.utils import get_default_random_seed
+
+
+def get_step_dataset(n: int = 200) -> pd.DataFrame:
+    """
+    A seeded dataset of n uniform instances of X and Y, whose target Z = 1[X > .5] + Y has a step along X.
+    """
+    x = np.random.default_rng(get_default_random_seed()).uniform(size=(n, 2))
+    return pd.DataFrame(x, columns=['X', 'Y']).assign(Z=np.where(x[:, 0] > .5, 1., 0.) + x[:, 1])
+
+
+def get_step_predictor(dataframe: pd.DataFrame) -> KNeighborsRegressor:
+    return KNeighborsRegressor(n_neighbors=3).fit(dataframe.iloc[:, :-1], dataframe.iloc[:, -1])
+
+
+def silent():
+    """
+    Silences the progress printed by the optimizers.
+    """
+    return contextlib.redirect_stdout(io.StringIO())
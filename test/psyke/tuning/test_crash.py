@@ -0,0 +1,29 @@
+import unittest
+from psyke.tuning.crash import CRASH
+from psyke.utils import Target
+from test.psyke.tuning import get_step_dataset, silent
+
+
+class TestCRASH(unittest.TestCase):
+
+    dataframe = get_step_dataset(300)
+
+    def search(self, max_gauss_components: int, n_jobs: int) -> list:
+        crash = CRASH(None, self.dataframe, max_depth=2, max_gauss_components=max_gauss_components, patience=2,
+                      output=Target.CONSTANT, n_jobs=n_jobs)
+        with silent():
+            crash.search()
+        return crash.params
+
+    def test_concurrent_search(self):
+        params = self.search(3, 1)
+        self.assertTrue(len(params) > 0)
+        self.assertEqual(params, self.search(3, 2))
+
+    def test_empty_components(self):
+        self.assertEqual([], self.search(1, 1))
+        self.assertEqual([], self.search(1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import numbers
+import unittest
+from psyke.tuning.halving import SuccessiveHalving
+from psyke.tuning.orchid import OrCHiD
+from psyke.tuning.pedro import PEDRO
+from test.psyke.tuning import get_step_dataset, get_step_predictor, silent
+
+
+class TestSuccessiveHalving(unittest.TestCase):
+
+    dataframe = get_step_dataset()
+    predictor = get_step_predictor(dataframe)
+
+    @staticmethod
+    def kind(param) -> type:
+        return numbers.Number if isinstance(param, numbers.Number) else type(param)
+
+    def check(self, optimizer, halving: SuccessiveHalving):
+        with silent():
+            optimizer.search()
+            halving.search()
+            best, expected = halving.get_best(), optimizer.get_best()
+        self.assertTrue(len(halving.params) > 0)
+        for params, expected_params in zip(halving.params + list(best), optimizer.params + list(expected)):
+            self.assertEqual(len(expected_params), len(params))
+            self.assertEqual([self.kind(param) for param in expected_params], [self.kind(param) for param in params])
+        self.assertEqual(len(expected), len(best))
+        self.assertEqual(halving._best(halving.params)[1], best[0])
+
+    def test_pedro(self):
+        optimizer = PEDRO(self.predictor, self.dataframe, max_depth=2, patience=1, algorithm=PEDRO.Algorithm.GRIDEX)
+        self.check(optimizer, SuccessiveHalving(optimizer, n_thresholds=3, min_examples=50))
+
+    def test_orchid(self):
+        optimizer = OrCHiD(self.dataframe, OrCHiD.Algorithm.ExACT, max_depth=2, patience=1, gauss_components=2)
+        self.check(optimizer, SuccessiveHalving(optimizer, n_thresholds=2, min_examples=50))
+
+
+if __name__ == '__main__':
+    unittest.main()
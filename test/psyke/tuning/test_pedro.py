@@ -0,0 +1,29 @@
+import unittest
+from psyke.tuning.pedro import PEDRO
+from test.psyke.tuning import get_step_dataset, get_step_predictor, silent
+
+
+class TestPEDRO(unittest.TestCase):
+
+    dataframe = get_step_dataset()
+    predictor = get_step_predictor(dataframe)
+
+    def search(self, n_jobs: int) -> list:
+        pedro = PEDRO(self.predictor, self.dataframe, max_depth=2, patience=1, algorithm=PEDRO.Algorithm.GRIDEX,
+                      n_jobs=n_jobs)
+        with silent():
+            pedro.search()
+        return [(error, n, threshold, str(grid)) for error, n, threshold, grid in pedro.params]
+
+    def test_concurrent_search(self):
+        params = self.search(1)
+        self.assertTrue(len(params) > 0)
+        self.assertEqual(params, self.search(2))
+
+    def test_invalid_jobs(self):
+        with self.assertRaises(ValueError):
+            self.search(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from psyke.tuning import ResultStore
+from psyke.tuning.pedro import PEDRO
+from test.psyke.tuning import get_step_dataset, get_step_predictor, silent
+
+
+class TestResultStore(unittest.TestCase):
+
+    dataframe = get_step_dataset()
+    predictor = get_step_predictor(dataframe)
+
+    def search(self, store: ResultStore, readability_tradeoff: float) -> tuple[PEDRO, int]:
+        pedro = PEDRO(self.predictor, self.dataframe, readability_tradeoff=readability_tradeoff, max_depth=2,
+                      patience=1, algorithm=PEDRO.Algorithm.GRIDEX, store=store)
+        algorithm, extractions = pedro.algorithm, []
+
+        def counting_algorithm(*args, **kwargs):
+            extractions.append(args)
+            return algorithm(*args, **kwargs)
+
+        pedro.algorithm = counting_algorithm
+        with silent():
+            pedro.search()
+        return pedro, len(extractions)
+
+    @staticmethod
+    def params(pedro: PEDRO) -> list:
+        return [(error, n, threshold, str(grid)) for error, n, threshold, grid in pedro.params]
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultStore(os.path.join(directory, 'results.db'))
+            first, extractions = self.search(store, 0.1)
+            self.assertTrue(extractions > 0)
+            second, extractions = self.search(ResultStore(store.path), 0.1)
+            self.assertEqual(0, extractions)
+            self.assertEqual(self.params(first), self.params(second))
+
+    def test_readability_tradeoff(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultStore(os.path.join(directory, 'results.db'))
+            self.search(store, 0.1)
+            pedro, extractions = self.search(store, 0.5)
+            self.assertEqual(0, extractions)
+            with silent():
+                best = pedro.get_best()[0]
+            self.assertEqual(min(pedro.params, key=lambda param: param[0] * np.ceil(param[1] * 0.5)), best)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeClassifier
+from psyke import Extractor
+from psyke.utils import get_default_random_seed
+from psyke.utils.cache import PredictionCache, enable_prediction_cache, disable_prediction_cache, cached_predict, \
+    ExtractionCache, enable_extraction_cache, disable_extraction_cache, get_extraction_cache, cached_extraction, \
+    predictor_digest
+from psyke.utils.dataframe import HashableDataFrame, get_discrete_features_supervised, get_discrete_dataset
+from psyke.utils.logic import pretty_theory
+
+
+class CountingRegressor(LinearRegression):
+
+    calls = 0
+
+    def predict(self, x):
+        CountingRegressor.calls += 1
+        return super().predict(x)
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    generator = np.random.default_rng(get_default_random_seed())
+    x = pd.DataFrame(generator.uniform(size=(100, 3)), columns=['X', 'Y', 'Z'])
+    predictor = CountingRegressor().fit(x, x.sum(axis=1))
+
+    def setUp(self):
+        CountingRegressor.calls = 0
+
+    def test_hit(self):
+        cache = PredictionCache()
+        first = cache.predict(self.predictor, self.x)
+        second = cache.predict(self.predictor, self.x.copy())
+        self.assertEqual(1, CountingRegressor.calls)
+        self.assertTrue(np.array_equal(self.predictor.predict(self.x), second))
+        self.assertFalse(first.flags.writeable)
+        cache.predict(CountingRegressor().fit(self.x, self.x.X), self.x)
+        self.assertEqual(3, CountingRegressor.calls)
+
+    def test_eviction(self):
+        cache = PredictionCache(max_bytes=2 * 50 * 8)
+        for start in [0, 50, 0, 25]:
+            cache.predict(self.predictor, self.x.iloc[start:start + 50])
+        self.assertEqual(3, CountingRegressor.calls)
+        self.assertEqual(2, len(cache))
+        self.assertTrue(cache.nbytes <= cache.max_bytes)
+        cache.predict(self.predictor, self.x.iloc[50:100])
+        self.assertEqual(4, CountingRegressor.calls)
+
+    def test_opt_in(self):
+        cached_predict(self.predictor, self.x)
+        cached_predict(self.predictor, self.x)
+        self.assertEqual(2, CountingRegressor.calls)
+        enable_prediction_cache()
+        cached_predict(self.predictor, self.x)
+        cached_predict(self.predictor, self.x)
+        disable_prediction_cache()
+        self.assertEqual(3, CountingRegressor.calls)
+
+
+
+class Owner:
+    pass
+
+
+class UnpicklableClassifier(DecisionTreeClassifier):
+
+    def __init__(self):
+        super().__init__(random_state=get_default_random_seed())
+        self.session = lambda: None
+
+
+class CountingClassifier(DecisionTreeClassifier):
+
+    predictions = 0
+    pickles = 0
+
+    def __init__(self):
+        super().__init__(random_state=get_default_random_seed())
+
+    def predict(self, x, check_input=True):
+        CountingClassifier.predictions += 1
+        return super().predict(x, check_input)
+
+    def __getstate__(self):
+        CountingClassifier.pickles += 1
+        return super().__getstate__()
+
+
+class TestExtractionCache(unittest.TestCase):
+
+    x = TestPredictionCache.x
+    iris = load_iris(as_frame=True).frame
+    discretization = get_discrete_features_supervised(iris)
+    dataframe = get_discrete_dataset(iris.iloc[:, :-1], discretization).join(iris.iloc[:, -1])
+
+    def setUp(self):
+        self.calls = 0
+        CountingClassifier.predictions, CountingClassifier.pickles = 0, 0
+
+    def tearDown(self):
+        enable_extraction_cache()
+
+    def compute(self):
+        self.calls += 1
+        return list(range(100))
+
+    def test_hit(self):
+        cache, owner = ExtractionCache(), Owner()
+        self.assertEqual(self.compute(), cache.get_or_set(owner, self.x, self.compute))
+        cache.get_or_set(owner, self.x.copy(), self.compute)
+        self.assertEqual(2, self.calls)
+        cache.get_or_set(owner, self.x.iloc[1:], self.compute)
+        cache.get_or_set(Owner(), self.x, self.compute)
+        self.assertEqual(4, self.calls)
+
+    def test_eviction(self):
+        cache, owner = ExtractionCache(max_bytes=2 * sys.getsizeof(list(range(100)))), Owner()
+        for start in [0, 50, 0, 25]:
+            cache.get_or_set(owner, self.x.iloc[start:start + 50], self.compute)
+        self.assertEqual(3, self.calls)
+        self.assertEqual(2, len(cache))
+        self.assertTrue(cache.nbytes <= cache.max_bytes)
+        cache.get_or_set(owner, self.x.iloc[50:100], self.compute)
+        self.assertEqual(4, self.calls)
+
+    def test_weak_reference(self):
+        cache, owner = ExtractionCache(), Owner()
+        cache.get_or_set(owner, self.x, self.compute)
+        self.assertEqual(1, len(cache))
+        del owner
+        gc.collect()
+        self.assertEqual(0, len(cache))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute, lambda: 'key')
+            result = ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute, lambda: 'key')
+            self.assertEqual(self.compute(), result)
+            self.assertEqual(2, self.calls)
+            ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute, lambda: 'other key')
+            ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute)
+            self.assertEqual(4, self.calls)
+            ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute, lambda: None)
+            ExtractionCache(path=path).get_or_set(Owner(), self.x, self.compute, lambda: None)
+            self.assertEqual(6, self.calls)
+
+    def test_default(self):
+        owner = Owner()
+        self.assertIsNotNone(get_extraction_cache())
+        cached_extraction(owner, self.x, self.compute)
+        cached_extraction(owner, self.x, self.compute)
+        self.assertEqual(1, self.calls)
+        disable_extraction_cache()
+        cached_extraction(owner, self.x, self.compute)
+        cached_extraction(owner, self.x, self.compute)
+        self.assertEqual(3, self.calls)
+
+    def test_real(self):
+        predictor = CountingClassifier().fit(self.dataframe.iloc[:, :-1], self.dataframe.iloc[:, -1])
+        extractor = Extractor.real(predictor, self.discretization)
+        theory = extractor.extract(self.dataframe)
+        ruleset, predictions = extractor._ruleset, CountingClassifier.predictions
+        self.assertEqual(pretty_theory(theory), pretty_theory(extractor.extract(self.dataframe)))
+        self.assertIs(ruleset, extractor._ruleset)
+        # Only the labels of the dataframe are predicted again, the rule search is not repeated
+        self.assertEqual(predictions + 1, CountingClassifier.predictions)
+        self.assertEqual(0, CountingClassifier.pickles)
+        self.assertEqual(extractor._ruleset.nbytes, get_extraction_cache().nbytes)
+
+    def test_predictor_digest(self):
+        predictor = CountingClassifier().fit(self.dataframe.iloc[:, :-1], self.dataframe.iloc[:, -1])
+        with tempfile.TemporaryDirectory() as directory:
+            enable_extraction_cache(path=os.path.join(directory, 'cache.db'))
+            theories = [pretty_theory(Extractor.real(predictor, self.discretization).extract(self.dataframe))
+                        for _ in range(3)]
+            self.assertEqual(1, CountingClassifier.pickles)
+            self.assertEqual(1, len(set(theories)))
+        self.assertEqual(predictor_digest(predictor), predictor_digest(predictor))
+        self.assertEqual(1, CountingClassifier.pickles)
+
+    def test_unpicklable_predictor(self):
+        predictor = UnpicklableClassifier().fit(self.dataframe.iloc[:, :-1], self.dataframe.iloc[:, -1])
+        self.assertRaises(Exception, pickle.dumps, predictor)
+        self.assertIsNone(predictor_digest(predictor))
+        with tempfile.TemporaryDirectory() as directory:
+            enable_extraction_cache(path=os.path.join(directory, 'cache.db'))
+            extractor = Extractor.real(predictor, self.discretization)
+            theory = extractor.extract(self.dataframe)
+            self.assertEqual(1, len(get_extraction_cache()))
+            self.assertEqual(pretty_theory(theory), pretty_theory(extractor.extract(self.dataframe)))
+
+    def test_fingerprint(self):
+        fingerprint = HashableDataFrame(self.x).fingerprint
+        self.assertEqual(fingerprint, HashableDataFrame(self.x.copy()).fingerprint)
+        changed = self.x.copy()
+        changed.iloc[3, 1] += 1e-9
+        self.assertNotEqual(fingerprint, HashableDataFrame(changed).fingerprint)
+        self.assertNotEqual(fingerprint, HashableDataFrame(self.x.set_axis(['X', 'Z', 'Y'], axis=1)).fingerprint)
+        labelled = self.x.assign(label=['a' if i % 2 else 'b' for i in range(len(self.x))])
+        self.assertNotEqual(HashableDataFrame(labelled).fingerprint,
+                            HashableDataFrame(labelled.assign(label=labelled.label.iloc[::-1].values)).fingerprint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import pandas as pd
+from psyke.schema import DiscreteFeature, LessThan, GreaterThan, Between, Outside, Constant
+from psyke.utils import get_default_random_seed
+from psyke.utils.dataframe import get_discrete_dataset, get_discrete_features_equal_frequency
+
+
+class TestDiscreteDataset(unittest.TestCase):
+
+    generator = np.random.default_rng(get_default_random_seed())
+    dataset = pd.DataFrame({'X': generator.uniform(size=50), 'Y': generator.integers(0, 3, size=50)},
+                           index=range(100, 150))
+    features = [
+        DiscreteFeature('X', {'X_2': LessThan(0.3), 'X_0': Between(0.3, 0.6), 'X_1': GreaterThan(0.6),
+                              'X_3': Outside(0.2, 0.8, False)}),
+        DiscreteFeature('Y', {'Y_0': Constant(0), 'Y_1': Constant(1), 'Y_2': Constant(2)})
+    ]
+
+    def expected(self, sort: bool) -> pd.DataFrame:
+        keys = [key for feature in self.features for key in feature.admissible_values]
+        values = {feature.name: feature.admissible_values for feature in self.features}
+        rows = [{key: int(value.is_in(self.dataset[name].iloc[index]))
+                 for name, admissible_values in values.items() for key, value in admissible_values.items()}
+                for index in range(self.dataset.shape[0])]
+        return pd.DataFrame(rows, columns=sorted(keys) if sort else keys)
+
+    def test_discrete_dataset(self):
+        for sort in [True, False]:
+            discrete = get_discrete_dataset(self.dataset, self.features, sort)
+            pd.testing.assert_frame_equal(self.expected(sort), discrete)
+            self.assertTrue(all(dtype == int for dtype in discrete.dtypes))
+
+    def test_one_hot(self):
+        features = get_discrete_features_equal_frequency(self.dataset, 4, output=False)
+        discrete = get_discrete_dataset(self.dataset, features)
+        for feature in features:
+            self.assertTrue(all(discrete[list(feature.admissible_values)].sum(axis=1) == 1))
+
+
+if __name__ == '__main__':
+    unittest.main()